@@ -0,0 +1,226 @@
+"""
+Accuracy + latency harness over a labelled frame corpus.
+
+Usage:
+    python benchmarks/accuracy.py corpus/                          # evaluate
+    python benchmarks/accuracy.py corpus/ --generate 60            # build a synthetic corpus first
+    python benchmarks/accuracy.py corpus/ --thresholds 0.7 0.8 0.9 --json report.json
+
+Corpus layout:
+    corpus/
+    ├── labels.json
+    ├── 0000.png
+    └── ...
+
+labels.json:
+    {"frames": [{"file": "0000.png",
+                 "hits": [{"template": "auto-challenge/action-1", "box": [x, y, w, h]}]}]}
+
+Every frame is run through ScreenImageDetector for each match mode and
+confidence threshold. A detection counts as a true positive when its box
+overlaps a label for the same template content with IoU >= --iou.
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from synthetic import RESOLUTIONS, background, paste, ui_scale
+
+from embedded_assets import ASSETS
+from core import Frame, FrameSource, ScreenImageDetector
+
+Box = Tuple[int, int, int, int]
+
+
+class LabelledFrameSource(FrameSource):
+    def __init__(self, root: Path, frames: list[dict]):
+        self.root = root
+        self.frames = frames
+        self.index = 0
+
+    def grab(self) -> Optional[Frame]:
+        if self.index >= len(self.frames):
+            return None
+        image = cv2.imread(str(self.root / self.frames[self.index]["file"]), cv2.IMREAD_COLOR)
+        self.index += 1
+        if image is None:
+            raise ValueError(f"Failed to read {self.frames[self.index - 1]['file']}")
+        return Frame(image)
+
+
+def iou(a: Box, b: Box) -> float:
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union else 0.0
+
+
+def center_distance(a: Box, b: Box) -> float:
+    return float(np.hypot((a[0] + a[2] / 2) - (b[0] + b[2] / 2), (a[1] + a[3] / 2) - (b[1] + b[3] / 2)))
+
+
+def library(detector: ScreenImageDetector) -> dict[str, np.ndarray]:
+    templates = {}
+    for sequence in detector.load_embedded_sequences(ASSETS):
+        for template, name in zip(sequence.templates, sequence.template_names):
+            templates[f"{sequence.name}/{name}"] = template
+    return templates
+
+
+def generate_corpus(root: Path, count: int, resolutions: list[str], seed: int) -> None:
+    detector = ScreenImageDetector()
+    templates = library(detector)
+    names = sorted(templates)
+    rng = np.random.default_rng(seed)
+    frames = []
+
+    root.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        size = RESOLUTIONS[resolutions[i % len(resolutions)]]
+        image = background(size, seed + i)
+        hits = []
+        occupied: list[Box] = []
+
+        for _ in range(int(rng.integers(0, 3))):
+            name = names[int(rng.integers(0, len(names)))]
+            template = templates[name]
+            scale = ui_scale(size) * float(rng.uniform(0.95, 1.05))
+            tw = int(template.shape[1] * scale)
+            th = int(template.shape[0] * scale)
+            position = (int(rng.integers(0, size[0] - tw)), int(rng.integers(0, size[1] - th)))
+            if any(iou((*position, tw, th), box) > 0 for box in occupied):
+                continue
+            box = paste(image, template, scale, position)
+            occupied.append(box)
+            hits.append({"template": name, "box": list(box)})
+
+        filename = f"{i:04d}.png"
+        cv2.imwrite(str(root / filename), image)
+        frames.append({"file": filename, "hits": hits})
+
+    (root / "labels.json").write_text(json.dumps({"frames": frames}, indent=2))
+    print(f"Generated {count} labelled frame(s) in {root}")
+
+
+def evaluate(root: Path, frames: list[dict], mode: str, threshold: float, iou_threshold: float, cold: bool, prefilter: bool = False) -> dict:
+    detector = ScreenImageDetector(confidence_threshold=threshold, match_mode=mode)
+    detector.change_gate.threshold = 0
+    detector.use_prefilter = prefilter
+    templates = library(detector)
+
+    content_ids = {name: detector.templates.get(template).template_id for name, template in templates.items()}
+    unique: dict[str, Tuple[str, np.ndarray]] = {}
+    for name, template in templates.items():
+        unique.setdefault(content_ids[name], (name, template))
+
+    detector.set_frame_source(LabelledFrameSource(root, frames))
+    tp = fp = fn = 0
+    errors: list[float] = []
+    latencies: list[float] = []
+    per_template: dict[str, list[int]] = {}
+
+    for labels in frames:
+        frame = detector.capture_screen()
+        if cold:
+            detector.clear_scale_cache()
+
+        expected: dict[str, list[Box]] = {}
+        for hit in labels["hits"]:
+            expected.setdefault(content_ids[hit["template"]], []).append(tuple(hit["box"]))
+
+        started = time.perf_counter()
+        detections = {content_id: detector.find_image(template, frame) for content_id, (_, template) in unique.items()}
+        latencies.append(time.perf_counter() - started)
+
+        for content_id, match in detections.items():
+            name = unique[content_id][0]
+            counts = per_template.setdefault(name, [0, 0])
+            boxes = expected.get(content_id, [])
+            counts[1] += len(boxes)
+
+            if match.found:
+                box = (match.x, match.y, match.width, match.height)
+                best = max(boxes, key=lambda b: iou(box, b), default=None)
+                if best is not None and iou(box, best) >= iou_threshold:
+                    tp += 1
+                    counts[0] += 1
+                    errors.append(center_distance(box, best))
+                    fn += len(boxes) - 1
+                else:
+                    fp += 1
+                    fn += len(boxes)
+            else:
+                fn += len(boxes)
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "threshold": threshold,
+        "precision": tp / (tp + fp) if tp + fp else 1.0,
+        "recall": tp / (tp + fn) if tp + fn else 1.0,
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "loc_error_px": float(np.mean(errors)) if errors else 0.0,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000 if latencies else 0.0,
+        "per_template_recall": {name: hits / total for name, (hits, total) in sorted(per_template.items()) if total},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure detection accuracy and latency on a labelled corpus")
+    parser.add_argument("corpus", type=Path)
+    parser.add_argument("--generate", type=int, metavar="N", help="Generate N synthetic labelled frames into the corpus first")
+    parser.add_argument("--resolutions", nargs="+", choices=list(RESOLUTIONS), default=["720p", "1080p"])
+    parser.add_argument("--modes", nargs="+", choices=ScreenImageDetector.MATCH_MODES, default=list(ScreenImageDetector.MATCH_MODES))
+    parser.add_argument("--thresholds", nargs="+", type=float, default=[0.7, 0.8, 0.9])
+    parser.add_argument("--iou", type=float, default=0.5, help="IoU needed for a detection to count")
+    parser.add_argument("--cold", action="store_true", help="Clear learned scales and locations before every frame")
+    parser.add_argument("--prefilter", action="store_true", help="Enable the flat-window prefilter to compare recall and latency")
+    parser.add_argument("--per-template", action="store_true", help="Also print recall per template")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_corpus(args.corpus, args.generate, args.resolutions, args.seed)
+
+    labels_path = args.corpus / "labels.json"
+    if not labels_path.exists():
+        parser.error(f"{labels_path} not found (use --generate to create a synthetic corpus)")
+    frames = json.loads(labels_path.read_text())["frames"]
+
+    print(f"Evaluating {len(frames)} frame(s) from {args.corpus}\n")
+    width = max(len(mode) for mode in ScreenImageDetector.MATCH_MODES)
+    print(f"{'mode':<{width}} {'thresh':>6} {'precision':>9} {'recall':>7} {'tp':>5} {'fp':>5} {'fn':>5} {'loc err':>8} {'p50 ms':>8} {'p95 ms':>8}")
+
+    report = []
+    for mode in args.modes:
+        for threshold in args.thresholds:
+            row = evaluate(args.corpus, frames, mode, threshold, args.iou, args.cold, args.prefilter)
+            report.append(row)
+            print(f"{mode:<{width}} {threshold:>6.2f} {row['precision']:>9.3f} {row['recall']:>7.3f} {row['tp']:>5} {row['fp']:>5} {row['fn']:>5} {row['loc_error_px']:>8.2f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f}")
+            if args.per_template:
+                for name, recall in row["per_template_recall"].items():
+                    print(f"{'':<{width}} {'':>6} {name:<36} recall {recall:.3f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Micro-benchmarks for the detection hot path.
+
+Usage:
+    python benchmarks/bench_detector.py                          # run everything
+    python benchmarks/bench_detector.py --resolutions 1080p 4k   # subset
+    python benchmarks/bench_detector.py --save benchmarks/baselines/local.json
+    python benchmarks/bench_detector.py --compare benchmarks/baselines/local.json
+
+Cases run against the real templates in `embedded_assets.ASSETS` on synthetic
+screenshots (see synthetic.py), with and without a target present, with a
+cold (cleared) or warm (already calibrated) scale cache. The frame-change
+gate is disabled so every iteration really matches. With --engine fft the
+per-frame transform is cached on the frame like its other views, so it is
+timed separately as frame_spectrum/<resolution>.
+"""
+
+import gc
+import sys
+import json
+import time
+import argparse
+import platform
+from pathlib import Path
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+from synthetic import RESOLUTIONS, StaticFrameSource, scene
+
+from embedded_assets import ASSETS
+from core import Frame, ScreenImageDetector, CURRENT_VERSION
+
+DEFAULT_TOLERANCE = 0.15
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def measure(fn: Callable[[], None], setup: Optional[Callable[[], None]], iterations: int, min_time: float) -> dict:
+    samples: list[float] = []
+    started = time.perf_counter()
+    gc.disable()
+    try:
+        while len(samples) < iterations or time.perf_counter() - started < min_time:
+            if setup:
+                setup()
+            t0 = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - t0)
+    finally:
+        gc.enable()
+
+    total = sum(samples)
+    return {
+        "iterations": len(samples),
+        "ops_per_sec": len(samples) / total if total else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+def make_detector(args: argparse.Namespace) -> tuple[ScreenImageDetector, list]:
+    detector = ScreenImageDetector(confidence_threshold=args.confidence, match_mode=args.match_mode)
+    detector.change_gate.threshold = 0
+    detector.use_incremental = args.incremental
+    detector.parallel = args.parallel
+    detector.match_engine = args.engine
+    sequences = detector.load_embedded_sequences(ASSETS)
+    return detector, sequences
+
+
+def run_cases(args: argparse.Namespace) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+
+    def record(name: str, stats: dict):
+        results[name] = stats
+        print(f"  {name:<48} {stats['ops_per_sec']:>9.1f} ops/s  p50 {stats['p50_ms']:>8.2f} ms  p95 {stats['p95_ms']:>8.2f} ms  p99 {stats['p99_ms']:>8.2f} ms")
+
+    record("load_embedded_sequences", measure(lambda: ScreenImageDetector().load_embedded_sequences(ASSETS), None, max(3, args.iterations // 5), 0))
+
+    for res_name in args.resolutions:
+        size = RESOLUTIONS[res_name]
+        detector, sequences = make_detector(args)
+        enabled = {sequence.name for sequence in sequences}
+        target = sequences[0].templates[0]
+
+        if args.engine == "fft":
+            image, _ = scene(size, None, seed=args.seed)
+            record(f"frame_spectrum/{res_name}", measure(lambda: Frame(image).spectrum(), None, args.iterations, args.min_time))
+
+        for present in (True, False):
+            image, _ = scene(size, target if present else None, seed=args.seed)
+            detector.set_frame_source(StaticFrameSource(image))
+            frame = detector.capture_screen()
+            label = "hit" if present else "miss"
+
+            def clear_memo():
+                frame.matches.clear()
+
+            def clear_all():
+                detector.clear_scale_cache()
+                frame.matches.clear()
+
+            for warm in (False, True):
+                cache = "warm" if warm else "cold"
+                setup = clear_memo if warm else clear_all
+                if warm:
+                    detector.find_image(target, frame)
+                    detector.find_first_sequence(sequences, enabled, frame)
+
+                record(f"find_image/{res_name}/{label}/{cache}", measure(lambda: detector.find_image(target, frame), setup, args.iterations, args.min_time))
+                record(f"find_first_sequence/{res_name}/{label}/{cache}", measure(lambda: detector.find_first_sequence(sequences, enabled, frame), setup, args.iterations, args.min_time))
+
+    return results
+
+
+def compare(results: dict[str, dict], baseline_path: Path, tolerance: float) -> list[str]:
+    baseline = json.loads(baseline_path.read_text())["results"]
+    regressions = []
+
+    print(f"\nComparing against {baseline_path} (tolerance {tolerance:.0%})")
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        change = stats["p50_ms"] / base["p50_ms"] - 1.0 if base["p50_ms"] else 0.0
+        flag = ""
+        if change > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -tolerance:
+            flag = "  faster"
+        print(f"  {name:<48} p50 {base['p50_ms']:>8.2f} -> {stats['p50_ms']:>8.2f} ms ({change:+.0%}){flag}")
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the detection hot path")
+    parser.add_argument("--resolutions", nargs="+", choices=list(RESOLUTIONS), default=list(RESOLUTIONS))
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum seconds per case")
+    parser.add_argument("--match-mode", choices=ScreenImageDetector.MATCH_MODES, default="full")
+    parser.add_argument("--incremental", action="store_true", help="Enable dirty-tile incremental matching")
+    parser.add_argument("--parallel", action="store_true", help="Match sequences and scales on a thread pool")
+    parser.add_argument("--engine", choices=ScreenImageDetector.MATCH_ENGINES, default="spatial", help="Correlation engine for every template")
+    parser.add_argument("--confidence", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", type=Path, help="Write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="Compare against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed p50 slowdown before flagging")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    print(f"Detector benchmarks (v{CURRENT_VERSION}, OpenCV {cv2.__version__}, NumPy {np.__version__}, mode={args.match_mode}, parallel={args.parallel}, engine={args.engine})")
+    results = run_cases(args)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "version": CURRENT_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "match_mode": args.match_mode,
+            "incremental": args.incremental,
+            "parallel": args.parallel,
+            "engine": args.engine,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        args.save.write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+        print(f"\nSaved baseline: {args.save}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) detected")
+            if args.fail_on_regression:
+                return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Deterministic game simulator for end-to-end throughput tests.
+
+Usage:
+    python benchmarks/simulator.py                              # 30 s at 720p
+    python benchmarks/simulator.py --resolution 1080p --duration 60 --match-mode pyramid
+
+GameSimulator stands in for the game window: it renders the current step of
+a flow from `embedded_assets.ASSETS` (e.g. auto-challenge action-1 ->
+action-3) at a random UI scale and position over a noisy background, and
+advances when a click lands inside the shown button; a step left unclicked
+for --abandon-frames grabs is dropped, like a game timing out. The real
+DetectionWorker / execute_sequence path drives it, headless, through
+SimulatedInput. Rendering depends only on the seed and the clicks made, so
+runs are reproducible.
+"""
+
+import sys
+import time
+import argparse
+from typing import Optional, Tuple
+
+import numpy as np
+
+from synthetic import RESOLUTIONS, background, paste, ui_scale
+
+from embedded_assets import ASSETS
+from core import ActionSequence, DetectionWorker, Frame, FrameSource, InputBackend, ScreenImageDetector
+
+
+class SimulatedInput(InputBackend):
+    def __init__(self, simulator: "GameSimulator"):
+        self.simulator = simulator
+
+    def click(self, x: int, y: int, clicks: int = 1, button: str = "left"):
+        self.simulator.click(x, y)
+
+
+class GameSimulator(FrameSource):
+    def __init__(self, sequences: list[ActionSequence], size: Tuple[int, int] = RESOLUTIONS["720p"], seed: int = 0, idle_frames: int = 3, scale_jitter: float = 0.05, abandon_frames: int = 30):
+        self.sequences = [sequence for sequence in sequences if sequence.templates]
+        self.size = size
+        self.idle_frames = idle_frames
+        self.scale_jitter = scale_jitter
+        self.abandon_frames = abandon_frames
+        self.input = SimulatedInput(self)
+        self._rng = np.random.default_rng(seed)
+
+        self.flow: Optional[ActionSequence] = None
+        self.step = 0
+        self.box: Optional[Tuple[int, int, int, int]] = None
+        self._idle_left = idle_frames
+        self._image = background(size, int(self._rng.integers(0, 2**31)))
+        self._shown_at: Optional[float] = None
+        self._shown_frames = 0
+        self._flow_started = 0.0
+
+        self.flows_started = 0
+        self.flows_completed = 0
+        self.flows_abandoned = 0
+        self.clicks = 0
+        self.misclicks = 0
+        self.click_latencies: list[float] = []
+        self.flow_times: list[float] = []
+
+    def _render(self):
+        image = background(self.size, int(self._rng.integers(0, 2**31)))
+        self.box = None
+        if self.flow is not None:
+            template = self.flow.templates[self.step]
+            scale = ui_scale(self.size) * float(self._rng.uniform(1 - self.scale_jitter, 1 + self.scale_jitter))
+            tw = int(template.shape[1] * scale)
+            th = int(template.shape[0] * scale)
+            position = (int(self._rng.integers(0, self.size[0] - tw)), int(self._rng.integers(0, self.size[1] - th)))
+            self.box = paste(image, template, scale, position)
+        self._image = image
+        self._shown_at = None
+        self._shown_frames = 0
+
+    def _start_flow(self):
+        self.flow = self.sequences[int(self._rng.integers(0, len(self.sequences)))]
+        self.step = 0
+        self.flows_started += 1
+        self._flow_started = time.perf_counter()
+        self._render()
+
+    def _end_flow(self):
+        self.flow = None
+        self._idle_left = self.idle_frames
+        self._render()
+
+    def grab(self) -> Frame:
+        if self.flow is None:
+            if self._idle_left > 0:
+                self._idle_left -= 1
+            else:
+                self._start_flow()
+        elif self._shown_frames >= self.abandon_frames:
+            self.flows_abandoned += 1
+            self._end_flow()
+
+        if self.box is not None:
+            self._shown_frames += 1
+            if self._shown_at is None:
+                self._shown_at = time.perf_counter()
+        return Frame(self._image)
+
+    def click(self, x: int, y: int):
+        now = time.perf_counter()
+        self.clicks += 1
+        if self.box is None:
+            self.misclicks += 1
+            return
+
+        bx, by, bw, bh = self.box
+        if not (bx <= x < bx + bw and by <= y < by + bh):
+            self.misclicks += 1
+            return
+
+        if self._shown_at is not None:
+            self.click_latencies.append(now - self._shown_at)
+
+        self.step += 1
+        if self.step >= self.flow.action_count:
+            self.flows_completed += 1
+            self.flow_times.append(now - self._flow_started)
+            self._end_flow()
+        else:
+            self._render()
+
+
+def percentile_ms(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))] * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the detection worker end-to-end against a simulated game")
+    parser.add_argument("--resolution", choices=list(RESOLUTIONS), default="720p")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--idle-frames", type=int, default=3, help="Frames with no button between flows")
+    parser.add_argument("--abandon-frames", type=int, default=30, help="Frames a step stays up before the flow is dropped")
+    parser.add_argument("--match-mode", choices=ScreenImageDetector.MATCH_MODES, default="full")
+    parser.add_argument("--parallel", action="store_true", help="Match sequences and scales on a thread pool")
+    parser.add_argument("--confidence", type=float, default=0.8)
+    parser.add_argument("--check-interval", type=float, default=0.0)
+    parser.add_argument("--cooldown", type=float, default=0.0)
+    parser.add_argument("--step-delay", type=float, default=0.0)
+    parser.add_argument("--verbose", action="store_true", help="Print the worker log")
+    args = parser.parse_args()
+
+    detector = ScreenImageDetector(confidence_threshold=args.confidence, match_mode=args.match_mode)
+    detector.parallel = args.parallel
+    sequences = detector.load_embedded_sequences(ASSETS)
+    enabled = {sequence.name for sequence in sequences}
+
+    simulator = GameSimulator(sequences, RESOLUTIONS[args.resolution], seed=args.seed, idle_frames=args.idle_frames, abandon_frames=args.abandon_frames)
+    detector.set_frame_source(simulator)
+    detector.input = simulator.input
+
+    worker = DetectionWorker(detector, sequences, lambda: enabled, check_interval=args.check_interval, cooldown=args.cooldown, step_delay=args.step_delay, log=print if args.verbose else None)
+    print(f"Simulating {args.resolution} for {args.duration:.0f}s (mode={args.match_mode}, seed={args.seed})")
+
+    started = time.perf_counter()
+    worker.run(duration=args.duration)
+    elapsed = time.perf_counter() - started
+    minutes = elapsed / 60.0
+
+    print(f"Ticks: {worker.ticks} ({worker.ticks / elapsed:.1f}/s)")
+    print(f"Flows: {simulator.flows_started} started, {simulator.flows_completed} completed ({simulator.flows_completed / minutes:.1f}/min), {simulator.flows_abandoned} abandoned")
+    print(f"Clicks: {simulator.clicks} ({simulator.misclicks} missed the button)")
+    print(f"Button shown -> click: p50 {percentile_ms(simulator.click_latencies, 50):.1f} ms, p95 {percentile_ms(simulator.click_latencies, 95):.1f} ms")
+    print(f"Flow duration: p50 {percentile_ms(simulator.flow_times, 50):.1f} ms, p95 {percentile_ms(simulator.flow_times, 95):.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Synthetic screenshots for benchmarks and accuracy checks.
+
+Frames are smooth noise (so matchTemplate has real texture to chew on) with
+optional templates pasted at the scale the game UI would have at that
+window size, relative to ScreenImageDetector.REFERENCE_SIZE.
+"""
+
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core import Frame, FrameSource, ScreenImageDetector
+
+RESOLUTIONS: dict[str, Tuple[int, int]] = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+}
+
+
+def ui_scale(size: Tuple[int, int]) -> float:
+    ref_w, ref_h = ScreenImageDetector.REFERENCE_SIZE
+    return (size[0] / ref_w + size[1] / ref_h) / 2.0
+
+
+def background(size: Tuple[int, int], seed: int = 0) -> np.ndarray:
+    width, height = size
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, 256, (max(1, height // 12), max(1, width // 12), 3), dtype=np.uint8)
+    image = cv2.resize(coarse, (width, height), interpolation=cv2.INTER_CUBIC)
+    noise = rng.integers(-12, 13, image.shape, dtype=np.int16)
+    return np.clip(image.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def paste(image: np.ndarray, template: np.ndarray, scale: float, position: Tuple[int, int]) -> Tuple[int, int, int, int]:
+    if abs(scale - 1.0) > 1e-6:
+        template = cv2.resize(template, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR)
+    th, tw = template.shape[:2]
+    x, y = position
+    image[y:y + th, x:x + tw] = template
+    return (x, y, tw, th)
+
+
+def scene(size: Tuple[int, int], template: Optional[np.ndarray] = None, seed: int = 0, scale: Optional[float] = None) -> Tuple[np.ndarray, Optional[Tuple[int, int, int, int]]]:
+    image = background(size, seed)
+    if template is None:
+        return image, None
+
+    scale = ui_scale(size) if scale is None else scale
+    rng = np.random.default_rng(seed + 1)
+    tw = int(template.shape[1] * scale)
+    th = int(template.shape[0] * scale)
+    x = int(rng.integers(0, size[0] - tw))
+    y = int(rng.integers(0, size[1] - th))
+    return image, paste(image, template, scale, (x, y))
+
+
+class StaticFrameSource(FrameSource):
+    def __init__(self, image: np.ndarray):
+        self.image = image
+
+    def grab(self) -> Frame:
+        return Frame(self.image)
@@ -2,7 +2,8 @@
 Build script to create standalone .exe using PyInstaller.
 
 Usage:
-    python build.py
+    python build.py            # single-file .exe
+    python build.py --onedir   # folder build, starts faster (nothing to unpack per launch)
 
 This will:
     1. Run embed_assets.py to update embedded assets
@@ -10,8 +11,11 @@ This will:
 
 Output:
     dist/TopHeroesAutoClicker.exe
+    dist/TopHeroesAutoClicker/TopHeroesAutoClicker.exe (--onedir)
 """
 
+import os
+import argparse
 import subprocess
 import sys
 from pathlib import Path
@@ -29,6 +33,10 @@ def run_command(cmd: list[str], description: str) -> bool:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Build the standalone executable")
+    parser.add_argument("--onedir", action="store_true", help="Build a folder instead of a single self-extracting .exe")
+    args = parser.parse_args()
+
     # Check if PyInstaller is installed
     try:
         import PyInstaller
@@ -42,7 +50,7 @@ def main():
     if assets_path.exists() and any(assets_path.iterdir()):
         if not run_command(
             [sys.executable, "scripts/embed_assets.py"],
-            "Step 1: Embedding assets into Python file"
+            "Step 1: Embedding assets into Python file and asset pack"
         ):
             print("Failed to embed assets!")
             return 1
@@ -54,7 +62,7 @@ def main():
     # Step 2: Run PyInstaller
     pyinstaller_args = [
         sys.executable, "-m", "PyInstaller",
-        "--onefile",
+        "--onedir" if args.onedir else "--onefile",
         "--windowed",  # No console window
         "--name", "TopHeroesAutoClicker",
         "--clean",
@@ -63,6 +71,12 @@ def main():
         "src/main.py",
     ]
 
+    # Ship the binary asset pack next to the code (loaded via sys._MEIPASS)
+    asset_pack = Path("src/assets.pack")
+    if asset_pack.exists():
+        pyinstaller_args.insert(-1, "--add-data")
+        pyinstaller_args.insert(-1, f"{asset_pack}{os.pathsep}.")
+
     # Check for icon
     if Path("icon.ico").exists():
         pyinstaller_args.insert(-1, "--icon")
@@ -76,7 +90,7 @@ def main():
     print("\n" + "="*50)
     print("BUILD COMPLETE!")
     print("="*50)
-    exe_path = Path("dist/TopHeroesAutoClicker.exe")
+    exe_path = Path("dist/TopHeroesAutoClicker/TopHeroesAutoClicker.exe" if args.onedir else "dist/TopHeroesAutoClicker.exe")
     if exe_path.exists():
         size_mb = exe_path.stat().st_size / (1024 * 1024)
         print(f"\nOutput: {exe_path}")
@@ -84,7 +98,7 @@ def main():
     else:
         print("\nOutput: dist/TopHeroesAutoClicker (check dist/ folder)")
 
-    print("\nTo run: dist/TopHeroesAutoClicker.exe")
+    print(f"\nTo run: {exe_path}")
 
     return 0
 
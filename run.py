@@ -1,16 +1,20 @@
 import sys
+import time
+
+started = time.perf_counter()
+
 from pathlib import Path
 
 # Add src to path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-import pyautogui
-pyautogui.PAUSE = 0.1
-pyautogui.FAILSAFE = True
+from core import StartupProfile
 
-from gui import AutoClickerApp
+startup = StartupProfile.from_argv(started=started)
+with startup.phase("import gui"):
+    from gui import AutoClickerApp
 
 if __name__ == "__main__":
-    app = AutoClickerApp()
-    app.run()
\ No newline at end of file
+    app = AutoClickerApp(startup)
+    app.run()
@@ -5,6 +5,8 @@ Usage:
     python scripts/embed_assets.py
 
 This reads from `assets/` folder and generates `src/embedded_assets.py`
+plus `src/assets.pack`, a binary pack of pre-decoded template arrays
+(BGR, grayscale and pyramid levels) that the app memory-maps at startup.
 
 Folder structure expected:
     assets/
@@ -17,15 +19,24 @@ Folder structure expected:
         └── action-3.png
 """
 
+import sys
 import base64
 from pathlib import Path
 
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.assetpack import build_asset_pack
+
 
 def embed_assets(
     assets_folder: str = "assets",
     output_file: str = "src/embedded_assets.py",
+    pack_file: str = "src/assets.pack",
 ) -> None:
-    """Convert assets folder to embedded Python file."""
+    """Convert assets folder to embedded Python file and binary asset pack."""
     assets_path = Path(assets_folder)
     output_path = Path(output_file)
 
@@ -35,6 +46,7 @@ def embed_assets(
         return
 
     assets_dict: dict[str, dict[str, str]] = {}
+    decoded: dict[str, dict[str, np.ndarray]] = {}
     total_images = 0
 
     # Process each subfolder
@@ -44,6 +56,7 @@ def embed_assets(
 
         sequence_name = subfolder.name
         actions: dict[str, str] = {}
+        images: dict[str, np.ndarray] = {}
 
         # Process each PNG in the subfolder
         png_files = sorted(subfolder.glob("*.png"))
@@ -59,10 +72,17 @@ def embed_assets(
                 image_bytes = f.read()
             base64_string = base64.b64encode(image_bytes).decode("utf-8")
 
+            image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                print(f"  Skipping '{png_file}': failed to decode")
+                continue
+
             actions[action_name] = base64_string
+            images[action_name] = image
             total_images += 1
 
         assets_dict[sequence_name] = actions
+        decoded[sequence_name] = images
         print(f"  Embedded '{sequence_name}': {len(actions)} action(s)")
 
     if not assets_dict:
@@ -89,7 +109,10 @@ def embed_assets(
 
         f.write("}\n")
 
+    pack_size = build_asset_pack(pack_file, decoded)
+
     print(f"\nGenerated: {output_path}")
+    print(f"Generated: {pack_file} ({pack_size / 1024:.1f} KB)")
     print(f"Total: {len(assets_dict)} sequence(s), {total_images} image(s)")
 
 
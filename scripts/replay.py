@@ -0,0 +1,80 @@
+"""
+Run the detection pipeline against recorded frames instead of the live screen.
+
+Usage:
+    python scripts/replay.py path/to/frames [--fps 10] [--loop] [--limit 500]
+
+`path` may be a directory of PNG/JPG frames, a session recorded from the
+app (Stats > Record session), a `.npy` stack (memory-mapped) or a `.npz`
+archive. Clicks are recorded instead of sent to the OS, so this
+runs headless on Linux and in CI.
+"""
+
+import sys
+import time
+import argparse
+from typing import Optional
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from embedded_assets import ASSETS
+from core import ScreenImageDetector, ReplayFrameSource, RecordingInput
+
+
+def replay(path: str, fps: Optional[float], loop: bool, limit: Optional[int], confidence: float, execute: bool) -> None:
+    detector = ScreenImageDetector(confidence_threshold=confidence)
+    sequences = detector.load_embedded_sequences(ASSETS)
+    enabled = {sequence.name for sequence in sequences}
+
+    source = ReplayFrameSource(path, fps=fps, loop=loop)
+    recorder = RecordingInput()
+    detector.set_frame_source(source)
+    detector.input = recorder
+
+    print(f"Replaying {len(source)} frame(s) from {path}")
+
+    ticks = 0
+    found = 0
+    completed = 0
+    start = time.perf_counter()
+
+    try:
+        while limit is None or ticks < limit:
+            frame = detector.capture_screen()
+            ticks += 1
+            sequence = detector.find_first_sequence(sequences, enabled, frame)
+            if sequence is None:
+                continue
+
+            found += 1
+            if execute and detector.execute_sequence(sequence, step_delay=0.0, timeout_per_step=1.0, check_interval=0.0, frame=frame):
+                completed += 1
+    except EOFError:
+        pass
+
+    elapsed = time.perf_counter() - start
+    print(f"Ticks: {ticks} in {elapsed:.2f}s ({ticks / elapsed if elapsed else 0:.1f} ticks/s)")
+    print(f"Sequences found: {found}, completed: {completed}, clicks: {len(recorder.clicks)}")
+    print(f"Static frames skipped: {detector.change_gate.skipped}/{detector.change_gate.checked}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded frames through the detector")
+    parser.add_argument("path", help="Directory of images, recorded session, .npy stack or .npz archive")
+    parser.add_argument("--fps", type=float, default=None, help="Replay rate (default: as fast as possible)")
+    parser.add_argument("--loop", action="store_true", help="Loop over the frames")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many ticks")
+    parser.add_argument("--confidence", type=float, default=0.8)
+    parser.add_argument("--no-execute", action="store_true", help="Only detect, do not run sequences")
+    args = parser.parse_args()
+
+    if args.loop and args.limit is None:
+        parser.error("--loop needs --limit")
+
+    replay(args.path, args.fps, args.loop, args.limit, args.confidence, not args.no_execute)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,60 @@
-from .config import Config
-from .detector import ScreenImageDetector
-from .window import GameWindow, WindowInfo
-from .models import ActionSequence, MatchResult
-from .updater import check_for_update_async, CURRENT_VERSION, RELEASES_PAGE_URL
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["Config", "ScreenImageDetector", "ActionSequence", "MatchResult", "GameWindow", "WindowInfo", "check_for_update_async", "CURRENT_VERSION", "RELEASES_PAGE_URL"]
\ No newline at end of file
+# Submodules pull in cv2/numpy/mss, so names are resolved on first use to keep startup fast.
+_EXPORTS = {
+    "Config": ".config",
+    "Frame": ".frame",
+    "FrameChangeGate": ".change",
+    "InputBackend": ".input",
+    "PyAutoGuiInput": ".input",
+    "RecordingInput": ".input",
+    "SessionRecorder": ".recorder",
+    "read_session_index": ".recorder",
+    "FrameSource": ".sources",
+    "ReplayFrameSource": ".sources",
+    "MetricsRegistry": ".metrics",
+    "Tracer": ".tracing",
+    "StartupProfile": ".startup",
+    "AssetPack": ".assetpack",
+    "build_asset_pack": ".assetpack",
+    "open_asset_pack": ".assetpack",
+    "ScreenImageDetector": ".detector",
+    "DetectionWorker": ".worker",
+    "GameWindow": ".window",
+    "WindowInfo": ".window",
+    "ActionSequence": ".models",
+    "MatchResult": ".models",
+    "check_for_update_async": ".updater",
+    "CURRENT_VERSION": ".updater",
+    "RELEASES_PAGE_URL": ".updater",
+}
+
+if TYPE_CHECKING:
+    from .config import Config
+    from .frame import Frame
+    from .change import FrameChangeGate
+    from .input import InputBackend, PyAutoGuiInput, RecordingInput
+    from .recorder import SessionRecorder, read_session_index
+    from .sources import FrameSource, ReplayFrameSource
+    from .metrics import MetricsRegistry
+    from .tracing import Tracer
+    from .startup import StartupProfile
+    from .assetpack import AssetPack, build_asset_pack, open_asset_pack
+    from .detector import ScreenImageDetector
+    from .worker import DetectionWorker
+    from .window import GameWindow, WindowInfo
+    from .models import ActionSequence, MatchResult
+    from .updater import check_for_update_async, CURRENT_VERSION, RELEASES_PAGE_URL
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = ["Config", "ScreenImageDetector", "AssetPack", "build_asset_pack", "open_asset_pack", "DetectionWorker", "Frame", "FrameChangeGate", "MetricsRegistry", "Tracer", "StartupProfile", "FrameSource", "ReplayFrameSource", "SessionRecorder", "read_session_index", "InputBackend", "PyAutoGuiInput", "RecordingInput", "ActionSequence", "MatchResult", "GameWindow", "WindowInfo", "check_for_update_async", "CURRENT_VERSION", "RELEASES_PAGE_URL"]
\ No newline at end of file
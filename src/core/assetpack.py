@@ -0,0 +1,100 @@
+import cv2
+import sys
+import json
+import struct
+import numpy as np
+from pathlib import Path
+from typing import Iterator, Optional, Tuple, Union
+
+from .templates import template_content_id
+
+PACK_FILENAME = "assets.pack"
+PACK_MAGIC = b"THAPACK1"
+PACK_ALIGN = 64
+HEADER = struct.Struct("<8sQ")
+
+
+def default_asset_pack_path() -> Path:
+    base = getattr(sys, "_MEIPASS", None)
+    return Path(base) / PACK_FILENAME if base else Path(__file__).resolve().parent.parent / PACK_FILENAME
+
+
+def _align(offset: int) -> int:
+    return (offset + PACK_ALIGN - 1) // PACK_ALIGN * PACK_ALIGN
+
+
+def build_asset_pack(path: Union[str, Path], sequences: dict[str, dict[str, np.ndarray]], levels: int = 2) -> int:
+    blobs: list[Tuple[int, np.ndarray]] = []
+    manifest: dict = {"version": 1, "levels": levels, "sequences": []}
+    offset = 0
+
+    def add(array: np.ndarray) -> dict:
+        nonlocal offset
+        array = np.ascontiguousarray(array)
+        offset = _align(offset)
+        spec = {"offset": offset, "shape": list(array.shape), "dtype": array.dtype.str}
+        blobs.append((offset, array))
+        offset += array.nbytes
+        return spec
+
+    shared: dict[str, dict] = {}
+    for sequence_name, actions in sequences.items():
+        entries = []
+        for action_name in sorted(actions):
+            template = actions[action_name]
+            template_id = template_content_id(template)
+            arrays = shared.get(template_id)
+            if arrays is None:
+                gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+                arrays = shared[template_id] = {"bgr": add(template), "gray": add(gray)}
+                level = gray
+                for n in range(1, levels + 1):
+                    level = cv2.pyrDown(level)
+                    arrays[f"gray@{n}"] = add(level)
+            entries.append({"name": action_name, "id": template_id, "arrays": arrays})
+        manifest["sequences"].append({"name": sequence_name, "actions": entries})
+
+    manifest_bytes = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+    data_start = _align(HEADER.size + len(manifest_bytes))
+
+    path = Path(path)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(PACK_MAGIC, len(manifest_bytes)))
+        f.write(manifest_bytes)
+        for blob_offset, array in blobs:
+            f.seek(data_start + blob_offset)
+            f.write(array.tobytes())
+    return path.stat().st_size
+
+
+class AssetPack:
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            magic, manifest_size = HEADER.unpack(f.read(HEADER.size))
+            if magic != PACK_MAGIC:
+                raise ValueError(f"Not an asset pack: {self.path}")
+            self.manifest = json.loads(f.read(manifest_size))
+        self._data_start = _align(HEADER.size + manifest_size)
+        self._map = np.memmap(self.path, dtype=np.uint8, mode="r")
+
+    @property
+    def levels(self) -> int:
+        return self.manifest.get("levels", 0)
+
+    def _array(self, spec: dict) -> np.ndarray:
+        dtype = np.dtype(spec["dtype"])
+        start = self._data_start + spec["offset"]
+        count = int(np.prod(spec["shape"]))
+        return np.asarray(self._map[start:start + count * dtype.itemsize]).view(dtype).reshape(spec["shape"])
+
+    def __iter__(self) -> Iterator[Tuple[str, list[Tuple[str, str, dict[str, np.ndarray]]]]]:
+        for sequence in self.manifest["sequences"]:
+            yield sequence["name"], [(action["name"], action["id"], {key: self._array(spec) for key, spec in action["arrays"].items()}) for action in sequence["actions"]]
+
+
+def open_asset_pack(path: Optional[Union[str, Path]] = None) -> Optional[AssetPack]:
+    path = Path(path) if path is not None else default_asset_pack_path()
+    if not path.exists():
+        return None
+    return AssetPack(path)
@@ -0,0 +1,73 @@
+import cv2
+import mss
+import threading
+import numpy as np
+from typing import Any, Optional, Tuple
+
+from .frame import Frame, FrameBuffers
+
+
+class CaptureSession:
+    BUFFER_SLOTS = 2
+
+    def __init__(self, zero_copy: bool = True):
+        self.owner_thread = threading.get_ident()
+        self.zero_copy = zero_copy
+        self.rebuilds = 0
+        self._sct: Optional[Any] = None
+        self._buffers: dict[Tuple[int, int], list[FrameBuffers]] = {}
+        self._slot = 0
+
+    def _ensure(self) -> Any:
+        if threading.get_ident() != self.owner_thread:
+            raise RuntimeError("CaptureSession is bound to the thread that created it; mss handles cannot be shared across threads")
+        if self._sct is None:
+            self._sct = mss.mss()
+        return self._sct
+
+    @property
+    def monitors(self) -> list[dict]:
+        return self._ensure().monitors
+
+    def grab(self, region: dict) -> Any:
+        try:
+            return self._ensure().grab(region)
+        except Exception:
+            self.reset()
+            raise
+
+    def grab_frame(self, region: dict) -> Frame:
+        screenshot = self.grab(region)
+        if not self.zero_copy:
+            return Frame(cv2.cvtColor(np.array(screenshot), cv2.COLOR_BGRA2BGR))
+
+        height, width = screenshot.height, screenshot.width
+        bgra = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(height, width, 4)
+        return Frame.from_bgra(bgra, self._next_buffers(height, width))
+
+    def _next_buffers(self, height: int, width: int) -> FrameBuffers:
+        slots = self._buffers.get((height, width))
+        if slots is None:
+            self._buffers = {(height, width): [FrameBuffers(height, width) for _ in range(self.BUFFER_SLOTS)]}
+            slots = self._buffers[(height, width)]
+        self._slot = (self._slot + 1) % len(slots)
+        return slots[self._slot]
+
+    def reset(self):
+        if self._sct is not None:
+            self.close()
+            self.rebuilds += 1
+
+    def close(self):
+        sct, self._sct = self._sct, None
+        if sct is not None:
+            try:
+                sct.close()
+            except Exception:
+                pass
+
+    def __enter__(self) -> "CaptureSession":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,63 @@
+import cv2
+import numpy as np
+from typing import Hashable, Optional, Tuple
+
+from .frame import Frame
+
+
+class FrameChangeGate:
+    SIGNATURE_SIZE = (64, 36)
+    DEFAULT_THRESHOLD = 8.0
+    MIN_CELL = 4
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.feature_size: Optional[int] = None
+        self.checked = 0
+        self.skipped = 0
+        self._reference: Optional[np.ndarray] = None
+        self._reference_key: Optional[Tuple[Hashable, Tuple[int, int], Tuple[int, int]]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    @property
+    def skip_rate(self) -> float:
+        return self.skipped / self.checked if self.checked else 0.0
+
+    def signature_size(self, frame: Frame) -> Tuple[int, int]:
+        width, height = self.SIGNATURE_SIZE
+        if self.feature_size:
+            cell = max(self.MIN_CELL, self.feature_size // 2)
+            width = min(frame.width, max(width, -(-frame.width // cell)))
+            height = min(frame.height, max(height, -(-frame.height // cell)))
+        return (width, height)
+
+    def signature(self, frame: Frame) -> np.ndarray:
+        return cv2.resize(frame.gray, self.signature_size(frame), interpolation=cv2.INTER_AREA)
+
+    def is_static(self, frame: Frame, key: Hashable = None) -> bool:
+        if not self.enabled:
+            return False
+
+        self.checked += 1
+        signature = self.signature(frame)
+        reference_key = (key, frame.size, signature.shape)
+
+        if self._reference is not None and self._reference_key == reference_key:
+            if float(cv2.absdiff(signature, self._reference).max()) <= self.threshold:
+                self.skipped += 1
+                return True
+
+        self._reference = signature
+        self._reference_key = reference_key
+        return False
+
+    def reset(self):
+        self._reference = None
+        self._reference_key = None
+
+    def reset_stats(self):
+        self.checked = 0
+        self.skipped = 0
@@ -7,6 +7,9 @@ from typing import Optional, Tuple
 class Config:
     APP_NAME = "TopHeroesAutoClicker"
     CONFIG_FILENAME = "config.json"
+    METRICS_FILENAME = "metrics.json"
+    TRACES_DIRNAME = "traces"
+    SESSIONS_DIRNAME = "sessions"
     DEFAULT_REFERENCE_SIZE = (1280, 720)
 
     def __init__(self):
@@ -23,6 +26,18 @@ class Config:
 
         return base / self.APP_NAME / self.CONFIG_FILENAME
 
+    @property
+    def metrics_path(self) -> Path:
+        return self.config_path.parent / self.METRICS_FILENAME
+
+    @property
+    def traces_dir(self) -> Path:
+        return self.config_path.parent / self.TRACES_DIRNAME
+
+    @property
+    def sessions_dir(self) -> Path:
+        return self.config_path.parent / self.SESSIONS_DIRNAME
+
     def _ensure_config_dir(self):
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -76,4 +91,28 @@ class Config:
     def set_reference_size(self, width: int, height: int):
         data = self._load()
         data["reference_size"] = [width, height]
-        self._save(data)
\ No newline at end of file
+        self._save(data)
+
+    def get_scale_calibration(self) -> dict[str, dict[str, float]]:
+        data = self._load()
+        calibration = data.get("scale_calibration")
+        if not isinstance(calibration, dict):
+            return {}
+
+        result = {}
+        for size_key, scales in calibration.items():
+            if isinstance(scales, dict):
+                result[size_key] = {template_id: float(scale) for template_id, scale in scales.items() if isinstance(scale, (int, float))}
+        return result
+
+    def set_scale_calibration(self, calibration: dict[str, dict[str, float]]):
+        data = self._load()
+        data["scale_calibration"] = calibration
+        self._save(data)
+
+    def save_metrics_snapshot(self, snapshot: dict):
+        try:
+            with open(self.metrics_path, "w") as f:
+                json.dump(snapshot, f, indent=2)
+        except IOError as e:
+            print(f"Failed to save metrics: {e}")
@@ -1,12 +1,28 @@
+import os
 import cv2
-import mss
 import time
 import base64
+import threading
 import numpy as np
-from typing import Callable, Optional, Tuple, List
-
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterator, Optional, Tuple, List, Union
+
+from .frame import Frame
+from .capture import CaptureSession
+from .input import InputBackend, PyAutoGuiInput
+from .sources import FrameSource
+from .change import FrameChangeGate
+from .incremental import IncrementalMatcher
+from .metrics import MetricsRegistry
+from .tracing import Tracer
 from .window import GameWindow, WindowInfo
 from .models import ActionSequence, MatchResult
+from .templates import TemplateStore, TemplateEntry
+from .assetpack import AssetPack
+from .matching import match_full, match_pyramid, match_region
+from .spectral import SpectralMatcher
+from .prefilter import FLAT_STD, candidate_mask, candidate_region, template_stats
 
 
 class ScreenImageDetector:
@@ -14,18 +30,65 @@ class ScreenImageDetector:
     COARSE_OFFSETS = [-0.4, -0.2, 0.0, 0.2, 0.4]
     FINE_OFFSETS = [-0.1, -0.05, 0.0, 0.05, 0.1]
     CACHED_OFFSETS = [-0.08, -0.04, 0.0, 0.04, 0.08]
-
-    def __init__(self, confidence_threshold: float = 0.8):
+    MATCH_MODES = ("full", "pyramid", "scale-major", "reference")
+    MATCH_ENGINES = ("spatial", "fft")
+    PYRAMID_MAX_LEVEL = 2
+    PYRAMID_MIN_TEMPLATE = 16
+    PYRAMID_CANDIDATES = 5
+    ROI_PADDING = 24
+    MAX_CALIBRATED_SIZES = 16
+    SCALE_MISS_LIMIT = 8
+    PARALLEL_WORKERS = min(4, os.cpu_count() or 1)
+    SCALE_BAND = 0.02
+    SCALE_MAJOR_REFINE_MARGIN = 0.2
+    REFERENCE_JITTER = [0.0, -0.02, 0.02, -0.04, 0.04]
+    PREFILTER_MAX_LEVEL = 2
+    PREFILTER_MIN_WINDOW = 6
+    PREFILTER_MAX_REGION = 0.5
+
+    def __init__(self, confidence_threshold: float = 0.8, match_mode: str = "full"):
         self.confidence_threshold = confidence_threshold
+        self.match_mode = match_mode if match_mode in self.MATCH_MODES else "full"
+        self.match_engine = "spatial"
+        self.spectral = SpectralMatcher()
         self.game_window = GameWindow()
         self.use_window_capture = False
+        self.frame_source: Optional[FrameSource] = None
+        self.input: InputBackend = PyAutoGuiInput()
         self._last_window_size: Optional[Tuple[int, int]] = None
         self._size_changed = False
-        self._scale_cache: dict[int, float] = {}
+        self._scale_calibration: dict[str, dict[str, float]] = {}
+        self._scale_cache: dict[str, float] = {}
+        self._scale_misses: dict[str, int] = {}
+        self.scale_calibration_dirty = False
         self._expected_scale: float = 1.0
+        self.templates = TemplateStore()
+        self.use_roi = True
+        self._last_locations: dict[str, Tuple[int, int, float]] = {}
+        self._predicted_scales: dict[str, float] = {}
+        self.last_resize_predicted = 0
+        self._capture_local = threading.local()
+        self.change_gate = FrameChangeGate()
+        self.metrics = MetricsRegistry()
+        self.tracer = Tracer()
+        self.decision_log: Optional[list[dict]] = None
+        self.use_prefilter = False
+        self.use_incremental = True
+        self.incremental = IncrementalMatcher()
+        self.parallel = False
+        self.parallel_workers = self.PARALLEL_WORKERS
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pool_local = threading.local()
+        self._activate_scale_cache()
+
+    @property
+    def _tracks_window_size(self) -> bool:
+        if self.frame_source is not None:
+            return self.frame_source.window_relative
+        return self.use_window_capture
 
     def _compute_expected_scale(self) -> float:
-        if not self.use_window_capture or not self._last_window_size:
+        if not self._tracks_window_size or not self._last_window_size:
             return 1.0
         current_w, current_h = self._last_window_size
         ref_w, ref_h = self.REFERENCE_SIZE
@@ -33,58 +96,225 @@ class ScreenImageDetector:
         scale_h = current_h / ref_h
         return (scale_w + scale_h) / 2.0
 
-    def _get_template_id(self, template: np.ndarray) -> int:
-        return hash(template.tobytes()[:1024])
+    def _get_template_id(self, template: np.ndarray) -> str:
+        return self.templates.get(template).template_id
 
     def _build_scales(self, template: np.ndarray) -> List[float]:
         template_id = self._get_template_id(template)
         expected = self._compute_expected_scale()
         self._expected_scale = expected
 
-        if template_id in self._scale_cache:
-            cached = self._scale_cache[template_id]
-            scales = [cached + off for off in self.CACHED_OFFSETS]
+        cached = self._scale_cache.get(template_id, self._predicted_scales.get(template_id))
+        if self._reference_scale() is not None:
+            scales = [round(expected * (1.0 + jitter), 2) for jitter in self.REFERENCE_JITTER]
+            if cached is not None and min(scales) <= cached <= max(scales):
+                scales = [cached] + [s for s in scales if s != cached]
+        elif cached is not None:
+            scales = [cached + off for off in sorted(self.CACHED_OFFSETS, key=abs)]
         else:
-            coarse = [expected + off for off in self.COARSE_OFFSETS]
-            fine = [expected + off for off in self.FINE_OFFSETS]
-            seen = set()
-            scales = []
-            for s in coarse + fine:
-                rounded = round(s, 2)
-                if rounded not in seen and 0.3 <= rounded <= 2.0:
-                    seen.add(rounded)
-                    scales.append(rounded)
-            scales.sort(key=lambda x: abs(x - expected))
+            scales = self._sweep_scales(expected)
         return scales
 
+    def _sweep_scales(self, expected: float) -> List[float]:
+        coarse = [expected + off for off in self.COARSE_OFFSETS]
+        fine = [expected + off for off in self.FINE_OFFSETS]
+        seen = set()
+        scales = []
+        for s in coarse + fine:
+            rounded = round(s, 2)
+            if rounded not in seen and 0.3 <= rounded <= 2.0:
+                seen.add(rounded)
+                scales.append(rounded)
+        scales.sort(key=lambda x: abs(x - expected))
+        return scales
+
+    def _scale_hint_missed(self, template_id: str) -> bool:
+        if self._predicted_scales.pop(template_id, None) is not None:
+            self._last_locations.pop(template_id, None)
+            return True
+        if template_id not in self._scale_cache:
+            return False
+
+        misses = self._scale_misses.get(template_id, 0) + 1
+        if misses < self.SCALE_MISS_LIMIT:
+            self._scale_misses[template_id] = misses
+            return False
+        self._scale_misses.pop(template_id, None)
+        self._scale_cache.pop(template_id, None)
+        self._last_locations.pop(template_id, None)
+        self.scale_calibration_dirty = True
+        self.metrics.increment("scale_invalidations")
+        return True
+
     def _update_scale_cache(self, template: np.ndarray, scale: float):
         template_id = self._get_template_id(template)
-        self._scale_cache[template_id] = scale
+        if self._predicted_scales.pop(template_id, None) is not None:
+            self.metrics.increment("resize_relocked")
+        self._scale_misses.pop(template_id, None)
+        if self._scale_cache.get(template_id) != scale:
+            self._scale_cache[template_id] = scale
+            self.scale_calibration_dirty = True
 
     def clear_scale_cache(self):
-        self._scale_cache.clear()
-
-    def capture_screen(self) -> np.ndarray:
+        if self._scale_cache:
+            self._scale_cache.clear()
+            self.scale_calibration_dirty = True
+        self._predicted_scales.clear()
+        self._scale_misses.clear()
+        self._last_locations.clear()
+        self.templates.clear_on_demand()
+        self.incremental.reset()
+
+    def _calibration_key(self) -> str:
+        if self._tracks_window_size and self._last_window_size:
+            return f"{self._last_window_size[0]}x{self._last_window_size[1]}"
+        return "screen"
+
+    def _activate_scale_cache(self):
+        key = self._calibration_key()
+        self._scale_cache = self._scale_calibration.pop(key, {})
+        self._scale_calibration[key] = self._scale_cache
+        while len(self._scale_calibration) > self.MAX_CALIBRATED_SIZES:
+            del self._scale_calibration[next(iter(self._scale_calibration))]
+        self._predicted_scales.clear()
+        self._scale_misses.clear()
+        self._last_locations.clear()
+        self.templates.clear_on_demand()
+        self.incremental.reset()
+
+    def _migrate_scale_cache(self, old_size: Tuple[int, int], new_size: Tuple[int, int]):
+        ratio_w = new_size[0] / old_size[0]
+        ratio_h = new_size[1] / old_size[1]
+        ratio = (ratio_w + ratio_h) / 2.0
+
+        previous = {**self._scale_cache, **self._predicted_scales}
+        locations = dict(self._last_locations)
+
+        self._last_window_size = new_size
+        self._activate_scale_cache()
+
+        for template_id, scale in previous.items():
+            predicted = round(scale * ratio, 2)
+            if template_id not in self._scale_cache and 0.3 <= predicted <= 2.0:
+                self._predicted_scales[template_id] = predicted
+
+        for template_id, (x, y, _) in locations.items():
+            scale = self._scale_cache.get(template_id, self._predicted_scales.get(template_id))
+            if scale is not None:
+                self._last_locations[template_id] = (int(x * ratio_w), int(y * ratio_h), scale)
+
+        self.last_resize_predicted = len(self._predicted_scales)
+
+    def load_scale_calibration(self, calibration: dict[str, dict[str, float]]):
+        self._scale_calibration = {key: dict(scales) for key, scales in calibration.items()}
+        self.scale_calibration_dirty = False
+        self._activate_scale_cache()
+
+    def get_scale_calibration(self) -> dict[str, dict[str, float]]:
+        self.scale_calibration_dirty = False
+        return {key: dict(scales) for key, scales in self._scale_calibration.items() if scales}
+
+    def get_roi_stats(self) -> dict[str, int]:
+        return {"hits": self.metrics.counter("roi_hits"), "misses": self.metrics.counter("roi_misses")}
+
+    @property
+    def capture_session(self) -> CaptureSession:
+        session = getattr(self._capture_local, "session", None)
+        if session is None:
+            session = CaptureSession()
+            self._capture_local.session = session
+        return session
+
+    def close_capture_session(self):
+        session = getattr(self._capture_local, "session", None)
+        if session is not None:
+            session.close()
+            self._capture_local.session = None
+
+    def _mark_pool_thread(self):
+        self._pool_local.active = True
+
+    def _use_pool(self, tasks: int) -> bool:
+        return self.parallel and self.parallel_workers > 1 and tasks > 1 and not getattr(self._pool_local, "active", False)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.parallel_workers, thread_name_prefix="match", initializer=self._mark_pool_thread)
+        return self._executor.submit(fn, *args)
+
+    def _drain(self, futures: List[Future]):
+        wait([future for future in futures if not future.cancel()])
+
+    def close_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def set_template_engine(self, template: np.ndarray, engine: Optional[str]):
+        if engine is not None and engine not in self.MATCH_ENGINES:
+            raise ValueError(f"Unknown match engine: {engine}")
+        self.templates.get(template).engine = engine
+
+    def _engine(self, entry: TemplateEntry) -> str:
+        return entry.engine or self.match_engine
+
+    def _prepare_frame(self, frame: Frame, use_grayscale: bool):
+        self._frame_view(frame, use_grayscale)
+        if self.match_engine == "fft" and self.match_mode in ("full", "pyramid"):
+            frame.spectrum(use_grayscale)
+        if self.match_mode == "pyramid":
+            frame.level(self.PYRAMID_MAX_LEVEL, use_grayscale)
+        if self.use_incremental and use_grayscale:
+            self.incremental.observe(frame)
+
+    def set_frame_source(self, source: Optional[FrameSource]):
+        if self.frame_source is not None and self.frame_source is not source:
+            self.frame_source.close()
+        self.frame_source = source
+        self._last_window_size = self.game_window.get_size() if source is None and self.use_window_capture else None
+        self._size_changed = False
+        self.change_gate.reset()
+        self._activate_scale_cache()
+
+    def _observe_size(self, current_size: Tuple[int, int]):
+        if current_size == self._last_window_size:
+            return
+        if self._last_window_size is None:
+            self._last_window_size = current_size
+            self._activate_scale_cache()
+            return
+        self._size_changed = True
+        self.change_gate.reset()
+        self.tracer.instant("window_resized", "window", old=list(self._last_window_size), new=list(current_size))
+        self._migrate_scale_cache(self._last_window_size, current_size)
+
+    def capture_screen(self) -> Frame:
+        with self.metrics.time("capture"):
+            return self._capture_frame()
+
+    def _capture_frame(self) -> Frame:
+        if self.frame_source is not None:
+            frame = self.frame_source.grab()
+            if frame is None:
+                raise EOFError("Frame source has no more frames")
+            if self.frame_source.window_relative:
+                self._observe_size(frame.size)
+            return frame
+
+        session = self.capture_session
         if self.use_window_capture and self.game_window.hwnd:
-            img = self.game_window.capture()
-            if img is not None:
+            frame = self.game_window.capture(session)
+            if frame is not None:
                 current_size = self.game_window.get_size()
                 if current_size:
-                    if self._last_window_size is not None and current_size != self._last_window_size:
-                        self._size_changed = True
-                        self.clear_scale_cache()
-                    self._last_window_size = current_size
-                return img
+                    self._observe_size(current_size)
+                return frame
 
             if self.game_window.capture_failures > 3:
                 if not self.game_window.is_valid():
                     self.use_window_capture = False
 
-        with mss.mss() as sct:
-            monitor_info = sct.monitors[0]
-            screenshot = sct.grab(monitor_info)
-            img = np.array(screenshot)
-            return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+        return session.grab_frame(session.monitors[0])
 
     def check_window_resized(self) -> Optional[Tuple[int, int]]:
         if self._size_changed:
@@ -93,12 +323,14 @@ class ScreenImageDetector:
         return None
 
     def _get_monitor_offset(self) -> Tuple[int, int]:
+        if self.frame_source is not None:
+            return self.frame_source.get_offset()
+
         if self.use_window_capture and self.game_window.hwnd:
             return self.game_window.get_offset()
 
-        with mss.mss() as sct:
-            mon = sct.monitors[0]
-            return (mon["left"], mon["top"])
+        mon = self.capture_session.monitors[0]
+        return (mon["left"], mon["top"])
 
     def list_windows(self, min_size: Tuple[int, int] = (200, 200)) -> List[WindowInfo]:
         return GameWindow.enumerate_windows(min_size)
@@ -108,7 +340,7 @@ class ScreenImageDetector:
             self.use_window_capture = True
             self._last_window_size = self.game_window.get_size()
             self._size_changed = False
-            self.clear_scale_cache()
+            self._activate_scale_cache()
             return True
         return False
 
@@ -117,7 +349,7 @@ class ScreenImageDetector:
             self.use_window_capture = True
             self._last_window_size = self.game_window.get_size()
             self._size_changed = False
-            self.clear_scale_cache()
+            self._activate_scale_cache()
             return True
         return False
 
@@ -125,7 +357,7 @@ class ScreenImageDetector:
         self.game_window.hwnd = None
         self.use_window_capture = False
         self._last_window_size = None
-        self.clear_scale_cache()
+        self._activate_scale_cache()
 
     def get_selected_window_info(self) -> Optional[WindowInfo]:
         if self.use_window_capture:
@@ -140,8 +372,17 @@ class ScreenImageDetector:
             raise ValueError("Failed to decode base64 image")
         return img
 
+    def _register_template(self, template: np.ndarray, name: str, **kwargs) -> TemplateEntry:
+        entry = self.templates.register(template, self._sweep_scales(1.0), **kwargs)
+        if entry.name == entry.template_id:
+            entry.name = name
+            for scale in self._sweep_scales(1.0):
+                self._template_stats(entry, scale, self._prefilter_level(entry.scaled_size(scale)))
+        return entry
+
     def load_embedded_sequences(self, assets_dict: dict[str, dict[str, str]]) -> list[ActionSequence]:
         sequences = []
+        decoded: dict[str, TemplateEntry] = {}
 
         for sequence_name, actions in assets_dict.items():
             templates = []
@@ -149,8 +390,10 @@ class ScreenImageDetector:
 
             for action_name in sorted(actions.keys()):
                 base64_data = actions[action_name]
-                template = self.base64_to_image(base64_data)
-                templates.append(template)
+                entry = decoded.get(base64_data)
+                if entry is None:
+                    entry = decoded[base64_data] = self._register_template(self.base64_to_image(base64_data), f"{sequence_name}/{action_name}")
+                templates.append(entry.template)
                 template_names.append(action_name)
 
             if templates:
@@ -158,52 +401,273 @@ class ScreenImageDetector:
 
         return sequences
 
-    def find_image(self, template: np.ndarray, screenshot: Optional[np.ndarray] = None, use_grayscale: bool = True) -> MatchResult:
-        if screenshot is None:
-            screenshot = self.capture_screen()
+    def load_asset_pack(self, pack: Union[AssetPack, str, Path]) -> list[ActionSequence]:
+        if not isinstance(pack, AssetPack):
+            pack = AssetPack(pack)
 
-        if use_grayscale:
-            screenshot_proc = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
-            template_proc = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-        else:
-            screenshot_proc = screenshot
-            template_proc = template
+        sequences = []
+        for sequence_name, actions in pack:
+            templates = []
+            template_names = []
+
+            for action_name, template_id, arrays in actions:
+                levels = [arrays[f"gray@{n}"] for n in range(1, self.PYRAMID_MAX_LEVEL + 1) if f"gray@{n}" in arrays]
+                entry = self._register_template(arrays["bgr"], f"{sequence_name}/{action_name}", gray=arrays.get("gray"), template_id=template_id, levels=levels)
+                templates.append(entry.template)
+                template_names.append(action_name)
+
+            if templates:
+                sequences.append(ActionSequence(name=sequence_name, templates=templates, template_names=template_names))
+
+        return sequences
+
+    def find_image(self, template: np.ndarray, screenshot: Optional[Union[Frame, np.ndarray]] = None, use_grayscale: bool = True) -> MatchResult:
+        frame = self.capture_screen() if screenshot is None else Frame.wrap(screenshot)
+        screenshot_proc = self._frame_view(frame, use_grayscale)
+
+        entry = self.templates.get(template)
+        memo_key = (entry.template_id, use_grayscale, self.confidence_threshold)
+        memoized = frame.matches.get(memo_key)
+        if memoized is not None:
+            self.metrics.increment("match_memo_hits")
+            return memoized
+
+        with self.tracer.span("find_image", "match", template=entry.name, mode=self.match_mode) as trace_args, self.metrics.time("match"):
+            match = self._find_image(frame, template, entry, screenshot_proc, use_grayscale)
+            frame.matches[memo_key] = match
+            trace_args.update(found=match.found, scale=match.scale, confidence=round(float(match.confidence), 4))
+            if self.decision_log is not None:
+                self.decision_log.append({"template": entry.name, "found": match.found, "confidence": round(float(match.confidence), 4), "scale": match.scale, "box": [match.x, match.y, match.width, match.height] if match.found else None})
+            return match
+
+    def _frame_view(self, frame: Frame, use_grayscale: bool) -> np.ndarray:
+        if frame.has_view(use_grayscale):
+            return frame.view(use_grayscale)
+        with self.metrics.time("convert"):
+            return frame.view(use_grayscale)
+
+    def _find_image(self, frame: Frame, template: np.ndarray, entry: TemplateEntry, screenshot_proc: np.ndarray, use_grayscale: bool) -> MatchResult:
+        if self.use_roi:
+            with self.metrics.time("match/roi"):
+                roi_match = self._find_in_last_location(frame, template, entry, use_grayscale)
+            if roi_match is not None:
+                self.metrics.increment("roi_hits" if roi_match.found else "roi_misses")
+                if roi_match.found:
+                    return roi_match
 
         scales = self._build_scales(template)
+        best_match = self._search_scales(frame, template, entry, scales, use_grayscale, screenshot_proc.shape)
+        if not best_match.found and self._scale_hint_missed(entry.template_id):
+            tried = set(scales)
+            retry = self._search_scales(frame, template, entry, [scale for scale in self._build_scales(template) if scale not in tried], use_grayscale, screenshot_proc.shape)
+            if retry.found or retry.confidence > best_match.confidence:
+                best_match = retry
+        return best_match
+
+    def _search_scales(self, frame: Frame, template: np.ndarray, entry: TemplateEntry, scales: List[float], use_grayscale: bool, image_shape: Tuple[int, ...]) -> MatchResult:
         best_match = MatchResult(found=False, confidence=0.0)
+        candidates = self._scale_candidates(entry, scales, use_grayscale, image_shape)
+        futures: list[Future] = []
+        if self._use_pool(len(scales)):
+            self._prepare_frame(frame, use_grayscale)
+            candidates = list(candidates)
+            futures = [self._submit(self._match_scale_timed, frame, entry, scaled_template, scale, use_grayscale) for scale, scaled_template, _ in candidates]
+
+        try:
+            for i, (scale, scaled_template, (tw, th)) in enumerate(candidates):
+                max_val, max_loc = futures[i].result() if futures else self._match_scale_timed(frame, entry, scaled_template, scale, use_grayscale)
+
+                if max_val > best_match.confidence:
+                    best_match = MatchResult(found=max_val >= self.confidence_threshold, x=max_loc[0], y=max_loc[1], width=tw, height=th, confidence=max_val, scale=scale)
+
+                    if max_val >= self.confidence_threshold:
+                        self._update_scale_cache(template, scale)
+                        self._last_locations[self._get_template_id(template)] = (max_loc[0], max_loc[1], scale)
+                        break
+        finally:
+            self._drain(futures)
 
-        for scale in scales:
-            tw = int(template_proc.shape[1] * scale)
-            th = int(template_proc.shape[0] * scale)
+        return best_match
 
-            if tw < 10 or th < 10:
+    def _scale_candidates(self, entry: TemplateEntry, scales: List[float], use_grayscale: bool, image_shape: Tuple[int, ...]) -> Iterator[Tuple[float, Optional[np.ndarray], Tuple[int, int]]]:
+        bands = set()
+        reference = self._reference_scale() is not None
+        for scale in scales:
+            if reference or self._scale_major(scale):
+                scale = scale if reference else self._scale_band(scale)
+                if scale in bands:
+                    continue
+                bands.add(scale)
+                tw, th = entry.scaled_size(scale)
+                if min(tw, th) < self.templates.MIN_SIZE or th > image_shape[0] or tw > image_shape[1]:
+                    continue
+                yield scale, None, (tw, th)
                 continue
-            if th > screenshot_proc.shape[0] or tw > screenshot_proc.shape[1]:
+
+            scaled_template = self.templates.scaled(entry, scale, use_grayscale)
+            if scaled_template is None:
                 continue
 
-            scaled_template = cv2.resize(template_proc, (tw, th), interpolation=cv2.INTER_AREA)
-            result = cv2.matchTemplate(screenshot_proc, scaled_template, cv2.TM_CCOEFF_NORMED)
-            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            th, tw = scaled_template.shape[:2]
+            if th > image_shape[0] or tw > image_shape[1]:
+                continue
+            yield scale, scaled_template, (tw, th)
+
+    def _scale_major(self, scale: float) -> bool:
+        return self.match_mode == "scale-major" and scale > 1.0
+
+    def _scale_band(self, scale: float) -> float:
+        return round(round(scale / self.SCALE_BAND) * self.SCALE_BAND, 2)
+
+    def _reference_scale(self) -> Optional[float]:
+        if self.match_mode != "reference" or not self._tracks_window_size or not self._last_window_size:
+            return None
+        expected = round(self._compute_expected_scale(), 2)
+        return expected if expected > 1.0 else None
+
+    def _prefilter_level(self, size: Tuple[int, int]) -> int:
+        level = 0
+        while level < self.PREFILTER_MAX_LEVEL and min(size) >> (level + 1) >= self.PREFILTER_MIN_WINDOW:
+            level += 1
+        return level
+
+    def _template_stats(self, entry: TemplateEntry, scale: float, level: int) -> Optional[Tuple[float, float]]:
+        key = (round(scale, 2), level)
+        stats = entry.stats.get(key)
+        if stats is None:
+            template = self.templates.scaled(entry, scale, True)
+            if template is None:
+                return None
+            for _ in range(level):
+                template = cv2.pyrDown(template)
+            stats = entry.stats[key] = template_stats(template)
+        return stats
+
+    def _prefilter(self, frame: Frame, entry: TemplateEntry, scale: float) -> Optional[Tuple[np.ndarray, int]]:
+        tw, th = entry.scaled_size(scale)
+        level = self._prefilter_level((tw, th))
+        stats = self._template_stats(entry, scale, level)
+        sums, sqsums = frame.integral(level)
+        ww, wh = tw >> level, th >> level
+        if stats is None or stats[1] < FLAT_STD or wh >= sums.shape[0] or ww >= sums.shape[1]:
+            return None
+        return candidate_mask(sums, sqsums, ww, wh), level
+
+    def _prefilter_rejects(self, prefilter: Optional[Tuple[np.ndarray, int]]) -> bool:
+        if prefilter is None or prefilter[0].any():
+            return False
+        self.metrics.increment("prefilter_rejects")
+        return True
 
-            if max_val > best_match.confidence:
-                best_match = MatchResult(found=max_val >= self.confidence_threshold, x=max_loc[0], y=max_loc[1], width=tw, height=th, confidence=max_val)
+    def _match_scaled_frame(self, frame: Frame, entry: TemplateEntry, scale: float, use_grayscale: bool) -> Tuple[float, Tuple[int, int]]:
+        frame_scale = self._reference_scale() or scale
+        factor = round(1.0 / frame_scale, 4)
+        image = frame.resized(factor, use_grayscale)
+        relative = round(scale / frame_scale, 2)
+        template = entry.source(use_grayscale) if relative == 1.0 else self.templates.scaled(entry, relative, use_grayscale)
+        if template is None or template.shape[0] > image.shape[0] or template.shape[1] > image.shape[1]:
+            return -1.0, (0, 0)
 
-                if max_val >= self.confidence_threshold:
-                    self._update_scale_cache(template, scale)
-                    break
+        if self.use_prefilter and self._prefilter_rejects(self._prefilter(frame, entry, scale)):
+            return -1.0, (0, 0)
 
-        return best_match
+        if self._engine(entry) == "fft":
+            max_val, (mx, my) = self.spectral.match(frame.spectrum(use_grayscale, factor), (entry.template_id, relative, use_grayscale), template)
+        else:
+            max_val, (mx, my) = match_full(image, template)
+        x = round(mx * frame.width / image.shape[1])
+        y = round(my * frame.height / image.shape[0])
+        if max_val < self.confidence_threshold - self.SCALE_MAJOR_REFINE_MARGIN:
+            return max_val, (x, y)
+
+        scaled_template = self.templates.scaled(entry, scale, use_grayscale)
+        if scaled_template is None:
+            return max_val, (x, y)
+        return match_region(frame.view(use_grayscale), scaled_template, x, y, int(round(scale)) + 2)
+
+    def _match_scale_timed(self, frame: Frame, entry: TemplateEntry, scaled_template: Optional[np.ndarray], scale: float, use_grayscale: bool) -> Tuple[float, Tuple[int, int]]:
+        with self.metrics.time(f"match/{entry.name}@{scale:.2f}"):
+            return self._match_scale(frame, entry, scaled_template, scale, use_grayscale)
+
+    def _find_in_last_location(self, frame: Frame, template: np.ndarray, entry: TemplateEntry, use_grayscale: bool) -> Optional[MatchResult]:
+        last = self._last_locations.get(self._get_template_id(template))
+        if last is None:
+            return None
+
+        x, y, scale = last
+        scaled_template = self.templates.scaled(entry, scale, use_grayscale)
+        if scaled_template is None:
+            return None
+
+        th, tw = scaled_template.shape[:2]
+        max_val, (mx, my) = match_region(frame.view(use_grayscale), scaled_template, x, y, self.ROI_PADDING)
+        found = max_val >= self.confidence_threshold
+        if found:
+            self._update_scale_cache(template, scale)
+            self._last_locations[self._get_template_id(template)] = (mx, my, scale)
+        return MatchResult(found=found, x=mx, y=my, width=tw, height=th, confidence=max(0.0, max_val), scale=scale)
+
+    def _pyramid_level(self, template: np.ndarray) -> int:
+        level = 0
+        th, tw = template.shape[:2]
+        while level < self.PYRAMID_MAX_LEVEL and min(tw, th) // 2 >= self.PYRAMID_MIN_TEMPLATE:
+            tw //= 2
+            th //= 2
+            level += 1
+        return level
+
+    def _uses_incremental(self, entry: TemplateEntry, use_grayscale: bool) -> bool:
+        return self.use_incremental and use_grayscale and self.match_mode == "full" and self._engine(entry) != "fft"
+
+    def _match_scale(self, frame: Frame, entry: TemplateEntry, scaled_template: Optional[np.ndarray], scale: float, use_grayscale: bool) -> Tuple[float, Tuple[int, int]]:
+        if scaled_template is None:
+            return self._match_scaled_frame(frame, entry, scale, use_grayscale)
+
+        prefilter = self._prefilter(frame, entry, scale) if self.use_prefilter and not self._uses_incremental(entry, use_grayscale) else None
+        if self._prefilter_rejects(prefilter):
+            return -1.0, (0, 0)
+
+        if self._engine(entry) == "fft":
+            return self.spectral.match(frame.spectrum(use_grayscale), (entry.template_id, round(scale, 2), use_grayscale), scaled_template)
+
+        image = frame.view(use_grayscale)
+
+        if self.match_mode == "pyramid":
+            level = self._pyramid_level(scaled_template)
+            coarse_template = self.templates.scaled(entry, scale, use_grayscale, level) if level else None
+            if coarse_template is not None:
+                coarse_image = frame.level(level, use_grayscale)
+                ch, cw = coarse_template.shape[:2]
+                if ch <= coarse_image.shape[0] and cw <= coarse_image.shape[1]:
+                    return match_pyramid(image, coarse_image, scaled_template, coarse_template, level, self.PYRAMID_CANDIDATES)
+
+        if self.use_incremental and use_grayscale:
+            return self.incremental.match(frame, (entry.template_id, round(scale, 2)), image, scaled_template)
+
+        if prefilter is not None:
+            mask, level = prefilter
+            th, tw = scaled_template.shape[:2]
+            x, y, width, height = candidate_region(mask, 1 << level, (tw, th), frame.size)
+            if width * height <= self.PREFILTER_MAX_REGION * frame.width * frame.height and width >= tw and height >= th:
+                self.metrics.increment("prefilter_narrowed")
+                crop, (ox, oy) = frame.crop(x, y, width, height, use_grayscale)
+                max_val, (mx, my) = match_full(crop, scaled_template)
+                return max_val, (ox + mx, oy + my)
+
+        return match_full(image, scaled_template)
 
     def click_at(self, x: int, y: int, clicks: int = 1, button: str = "left"):
-        import pyautogui
-
         offset_x, offset_y = self._get_monitor_offset()
         abs_x = x + offset_x
         abs_y = y + offset_y
-        pyautogui.click(abs_x, abs_y, clicks=clicks, button=button)
+        with self.tracer.span("click", "input", x=abs_x, y=abs_y, button=button), self.metrics.time("click"):
+            self.input.click(abs_x, abs_y, clicks=clicks, button=button)
+        self.metrics.increment("clicks")
+        if self.decision_log is not None:
+            self.decision_log.append({"click": [x, y], "button": button, "clicks": clicks})
 
-    def find_and_click(self, template: np.ndarray, clicks: int = 1, button: str = "left", offset: Tuple[int, int] = (0, 0)) -> MatchResult:
-        match = self.find_image(template)
+    def find_and_click(self, template: np.ndarray, clicks: int = 1, button: str = "left", offset: Tuple[int, int] = (0, 0), screenshot: Optional[Union[Frame, np.ndarray]] = None) -> MatchResult:
+        match = self.find_image(template, screenshot)
 
         if match.found:
             center_x, center_y = match.center
@@ -213,7 +677,7 @@ class ScreenImageDetector:
 
         return match
 
-    def execute_sequence(self, sequence: ActionSequence, step_delay: float = 0.5, timeout_per_step: float = 10.0, check_interval: float = 0.3, log_callback: Optional[Callable[[str], None]] = None, stop_flag: Optional[Callable[[], bool]] = None) -> bool:
+    def execute_sequence(self, sequence: ActionSequence, step_delay: float = 0.5, timeout_per_step: float = 10.0, check_interval: float = 0.3, log_callback: Optional[Callable[[str], None]] = None, stop_flag: Optional[Callable[[], bool]] = None, frame: Optional[Frame] = None, on_step: Optional[Callable[[str, Optional[Frame], MatchResult], None]] = None) -> bool:
         def log(msg: str):
             if log_callback:
                 log_callback(msg)
@@ -229,7 +693,13 @@ class ScreenImageDetector:
                     log("Stopped by user")
                     return False
 
-                match = self.find_and_click(template)
+                with self.tracer.span("step", "sequence", sequence=sequence.name, step=name, index=i + 1) as trace_args:
+                    captured = self.capture_screen() if frame is None else None
+                    match = self.find_and_click(template, screenshot=frame if captured is None else captured)
+                    trace_args["found"] = match.found
+                frame = None
+                if on_step:
+                    on_step(name, captured, match)
                 if match.found:
                     log(f"  [{i+1}/{len(sequence.templates)}] Clicked '{name}' at {match.center}")
                     found = True
@@ -238,22 +708,39 @@ class ScreenImageDetector:
                 time.sleep(check_interval)
 
             if not found:
+                self.tracer.instant("step_timeout", "sequence", sequence=sequence.name, step=name, index=i + 1)
                 log(f"  [{i+1}/{len(sequence.templates)}] Timeout: '{name}'")
                 return False
 
         return True
 
-    def find_first_sequence(self, sequences: list[ActionSequence], enabled_sequences: set[str], screenshot: Optional[np.ndarray] = None) -> Optional[ActionSequence]:
-        if screenshot is None:
-            screenshot = self.capture_screen()
-
-        for sequence in sequences:
-            if sequence.name not in enabled_sequences:
-                continue
-
-            if sequence.templates:
-                match = self.find_image(sequence.templates[0], screenshot)
+    def find_first_sequence(self, sequences: list[ActionSequence], enabled_sequences: set[str], screenshot: Optional[Union[Frame, np.ndarray]] = None) -> Optional[ActionSequence]:
+        frame = self.capture_screen() if screenshot is None else Frame.wrap(screenshot)
+
+        candidates = [sequence for sequence in sequences if sequence.name in enabled_sequences and sequence.templates]
+        if candidates:
+            smallest = min(min(sequence.templates[0].shape[:2]) for sequence in candidates)
+            self.change_gate.feature_size = int(smallest * max(0.3, self._compute_expected_scale() + min(self.COARSE_OFFSETS)))
+
+        if self.change_gate.is_static(frame, frozenset(enabled_sequences)):
+            return None
+
+        futures: dict[int, Future] = {}
+        if self._use_pool(len(candidates)):
+            self._prepare_frame(frame, True)
+            for sequence in candidates:
+                template = sequence.templates[0]
+                if id(template) not in futures:
+                    futures[id(template)] = self._submit(self.find_image, template, frame)
+
+        try:
+            for sequence in candidates:
+                future = futures.get(id(sequence.templates[0]))
+                match = future.result() if future else self.find_image(sequence.templates[0], frame)
                 if match.found:
+                    self.change_gate.reset()
                     return sequence
+        finally:
+            self._drain(list(futures.values()))
 
         return None
\ No newline at end of file
@@ -0,0 +1,122 @@
+import cv2
+import numpy as np
+from typing import Optional, Tuple, Union
+
+from .models import MatchResult
+from .spectral import FrameSpectrum
+
+
+class FrameBuffers:
+    def __init__(self, height: int, width: int):
+        self.gray = np.empty((height, width), dtype=np.uint8)
+        self.bgr = np.empty((height, width, 3), dtype=np.uint8)
+
+
+class Frame:
+    def __init__(self, image: Optional[np.ndarray] = None, bgra: Optional[np.ndarray] = None, buffers: Optional[FrameBuffers] = None):
+        if image is None and bgra is None:
+            raise ValueError("Frame needs a BGR image or a BGRA buffer")
+        self._image = image
+        self.bgra = bgra
+        self.buffers = buffers
+        self._shape = (image if image is not None else bgra).shape[:2]
+        self._gray: Optional[np.ndarray] = None
+        self._levels: dict[Tuple[int, bool], np.ndarray] = {}
+        self._crops: dict[Tuple[int, int, int, int, bool], Tuple[np.ndarray, Tuple[int, int]]] = {}
+        self._resized: dict[Tuple[float, bool], np.ndarray] = {}
+        self._spectra: dict[Tuple[float, bool], FrameSpectrum] = {}
+        self._integrals: dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self.matches: dict[Tuple[str, bool, float], MatchResult] = {}
+
+    @classmethod
+    def wrap(cls, screenshot: Union["Frame", np.ndarray]) -> "Frame":
+        if isinstance(screenshot, Frame):
+            return screenshot
+        return cls(screenshot)
+
+    @classmethod
+    def from_bgra(cls, bgra: np.ndarray, buffers: Optional[FrameBuffers] = None) -> "Frame":
+        return cls(bgra=bgra, buffers=buffers)
+
+    @property
+    def width(self) -> int:
+        return self._shape[1]
+
+    @property
+    def height(self) -> int:
+        return self._shape[0]
+
+    @property
+    def image(self) -> np.ndarray:
+        if self._image is None:
+            dst = self.buffers.bgr if self.buffers is not None else None
+            self._image = cv2.cvtColor(self.bgra, cv2.COLOR_BGRA2BGR, dst=dst)
+        return self._image
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+
+    @property
+    def gray(self) -> np.ndarray:
+        if self._gray is None:
+            dst = self.buffers.gray if self.buffers is not None else None
+            if self._image is None:
+                self._gray = cv2.cvtColor(self.bgra, cv2.COLOR_BGRA2GRAY, dst=dst)
+            else:
+                self._gray = cv2.cvtColor(self._image, cv2.COLOR_BGR2GRAY, dst=dst)
+        return self._gray
+
+    def has_view(self, grayscale: bool = True) -> bool:
+        return (self._gray if grayscale else self._image) is not None
+
+    def view(self, grayscale: bool = True) -> np.ndarray:
+        return self.gray if grayscale else self.image
+
+    def level(self, n: int, grayscale: bool = True) -> np.ndarray:
+        if n <= 0:
+            return self.view(grayscale)
+
+        key = (n, grayscale)
+        cached = self._levels.get(key)
+        if cached is None:
+            cached = cv2.pyrDown(self.level(n - 1, grayscale))
+            self._levels[key] = cached
+        return cached
+
+    def resized(self, factor: float, grayscale: bool = True) -> np.ndarray:
+        key = (factor, grayscale)
+        cached = self._resized.get(key)
+        if cached is None:
+            size = (max(1, round(self.width * factor)), max(1, round(self.height * factor)))
+            cached = cv2.resize(self.view(grayscale), size, interpolation=cv2.INTER_AREA if factor < 1 else cv2.INTER_LINEAR)
+            self._resized[key] = cached
+        return cached
+
+    def integral(self, level: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        cached = self._integrals.get(level)
+        if cached is None:
+            cached = cv2.integral2(self.level(level), sdepth=cv2.CV_32S, sqdepth=cv2.CV_64F)
+            self._integrals[level] = cached
+        return cached
+
+    def spectrum(self, grayscale: bool = True, factor: float = 1.0) -> FrameSpectrum:
+        key = (factor, grayscale)
+        cached = self._spectra.get(key)
+        if cached is None:
+            cached = FrameSpectrum(self.view(grayscale) if factor == 1.0 else self.resized(factor, grayscale))
+            self._spectra[key] = cached
+        return cached
+
+    def crop(self, x: int, y: int, width: int, height: int, grayscale: bool = True) -> Tuple[np.ndarray, Tuple[int, int]]:
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = min(self.width, x + width)
+        y1 = min(self.height, y + height)
+
+        key = (x0, y0, x1, y1, grayscale)
+        cached = self._crops.get(key)
+        if cached is None:
+            cached = (self.view(grayscale)[y0:y1, x0:x1], (x0, y0))
+            self._crops[key] = cached
+        return cached
@@ -0,0 +1,177 @@
+import cv2
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from .frame import Frame
+
+
+class TileCache:
+    __slots__ = ("generation", "result_shape", "maxima", "locations")
+
+    def __init__(self, generation: int, result_shape: Tuple[int, int], maxima: np.ndarray, locations: np.ndarray):
+        self.generation = generation
+        self.result_shape = result_shape
+        self.maxima = maxima
+        self.locations = locations
+
+
+class IncrementalMatcher:
+    TILE_SIZE = 64
+    FULL_RESCAN_RATIO = 0.5
+    MAX_CACHES = 128
+
+    def __init__(self, tile_size: int = TILE_SIZE, threshold: int = 0):
+        self.tile_size = tile_size
+        self.threshold = threshold
+        self.generation = 0
+        self.tiles_matched = 0
+        self.tiles_reused = 0
+        self._frame: Optional[Frame] = None
+        self._previous: Optional[np.ndarray] = None
+        self._changed_at: Optional[np.ndarray] = None
+        self._caches: OrderedDict[Hashable, TileCache] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def reset(self):
+        with self._lock:
+            self._frame = None
+            self._previous = None
+            self._changed_at = None
+            self._caches.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        return {"matched": self.tiles_matched, "reused": self.tiles_reused}
+
+    def reset_stats(self):
+        self.tiles_matched = 0
+        self.tiles_reused = 0
+
+    def _grid(self, height: int, width: int) -> Tuple[int, int]:
+        t = self.tile_size
+        return (-(-height // t), -(-width // t))
+
+    def _tile_max(self, image: np.ndarray) -> np.ndarray:
+        t = self.tile_size
+        rows, cols = self._grid(*image.shape[:2])
+        padded = np.zeros((rows * t, cols * t), dtype=image.dtype)
+        padded[:image.shape[0], :image.shape[1]] = image
+        return padded.reshape(rows, t, cols, t).max(axis=(1, 3))
+
+    def observe(self, frame: Frame):
+        if frame is self._frame:
+            return
+
+        with self._lock:
+            if frame is not self._frame:
+                self._observe(frame)
+
+    def _observe(self, frame: Frame):
+        self._frame = frame
+        self.generation += 1
+        gray = frame.gray
+
+        if self._previous is None or self._previous.shape != gray.shape:
+            self._previous = gray.copy()
+            self._changed_at = np.full(self._grid(*gray.shape), self.generation, dtype=np.int64)
+            self._caches.clear()
+            return
+
+        diff = cv2.absdiff(gray, self._previous)
+        np.copyto(self._previous, gray)
+        self._changed_at[self._tile_max(diff) > self.threshold] = self.generation
+
+    def _stale_tiles(self, generation: int, template_size: Tuple[int, int], grid: Tuple[int, int]) -> np.ndarray:
+        t = self.tile_size
+        th, tw = template_size
+        rows, cols = grid
+        reach_y = (t + th - 2) // t
+        reach_x = (t + tw - 2) // t
+
+        changed = self._changed_at > generation
+        padded = np.zeros((rows + reach_y, cols + reach_x), dtype=bool)
+        src = changed[:rows + reach_y, :cols + reach_x]
+        padded[:src.shape[0], :src.shape[1]] = src
+
+        stale = np.zeros((rows, cols), dtype=bool)
+        for dy in range(reach_y + 1):
+            for dx in range(reach_x + 1):
+                stale |= padded[dy:dy + rows, dx:dx + cols]
+        return stale
+
+    def _full_scan(self, image: np.ndarray, template: np.ndarray, grid: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        t = self.tile_size
+        rows, cols = grid
+        result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+
+        maxima = np.empty((rows, cols), dtype=np.float32)
+        locations = np.empty((rows, cols, 2), dtype=np.int32)
+        for row in range(rows):
+            for col in range(cols):
+                _, max_val, _, (mx, my) = cv2.minMaxLoc(result[row * t:(row + 1) * t, col * t:(col + 1) * t])
+                maxima[row, col] = max_val
+                locations[row, col] = (col * t + mx, row * t + my)
+        return maxima, locations
+
+    def _rescan_tiles(self, image: np.ndarray, template: np.ndarray, cache: TileCache, stale: np.ndarray):
+        t = self.tile_size
+        th, tw = template.shape[:2]
+        result_h, result_w = cache.result_shape
+
+        for row in np.flatnonzero(stale.any(axis=1)):
+            cols = np.flatnonzero(stale[row])
+            runs = np.split(cols, np.flatnonzero(np.diff(cols) > 1) + 1)
+            y0 = row * t
+            y1 = min(y0 + t, result_h)
+
+            for run in runs:
+                x0 = run[0] * t
+                x1 = min((run[-1] + 1) * t, result_w)
+                result = cv2.matchTemplate(image[y0:y1 + th - 1, x0:x1 + tw - 1], template, cv2.TM_CCOEFF_NORMED)
+
+                for col in run:
+                    left = col * t - x0
+                    _, max_val, _, (mx, my) = cv2.minMaxLoc(result[:, left:left + t])
+                    cache.maxima[row, col] = max_val
+                    cache.locations[row, col] = (col * t + mx, y0 + my)
+
+    def match(self, frame: Frame, key: Hashable, image: np.ndarray, template: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+        self.observe(frame)
+        th, tw = template.shape[:2]
+        result_shape = (image.shape[0] - th + 1, image.shape[1] - tw + 1)
+        grid = self._grid(*result_shape)
+        tile_count = grid[0] * grid[1]
+
+        generation = self.generation
+
+        with self._lock:
+            cache = self._caches.get(key)
+            if cache is not None:
+                self._caches.move_to_end(key)
+        if cache is not None and cache.result_shape == result_shape:
+            stale = self._stale_tiles(cache.generation, (th, tw), grid)
+            stale_count = int(stale.sum())
+            if stale_count <= tile_count * self.FULL_RESCAN_RATIO:
+                if stale_count:
+                    self._rescan_tiles(image, template, cache, stale)
+                with self._lock:
+                    self.tiles_matched += stale_count
+                    self.tiles_reused += tile_count - stale_count
+                cache.generation = generation
+                return self._best(cache)
+
+        maxima, locations = self._full_scan(image, template, grid)
+        cache = TileCache(generation, result_shape, maxima, locations)
+        with self._lock:
+            self._caches[key] = cache
+            self._caches.move_to_end(key)
+            while len(self._caches) > self.MAX_CACHES:
+                self._caches.popitem(last=False)
+            self.tiles_matched += tile_count
+        return self._best(cache)
+
+    def _best(self, cache: TileCache) -> Tuple[float, Tuple[int, int]]:
+        row, col = np.unravel_index(int(cache.maxima.argmax()), cache.maxima.shape)
+        x, y = cache.locations[row, col]
+        return float(cache.maxima[row, col]), (int(x), int(y))
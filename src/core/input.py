@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+
+
+class InputBackend(ABC):
+    @abstractmethod
+    def click(self, x: int, y: int, clicks: int = 1, button: str = "left"):
+        ...
+
+
+class PyAutoGuiInput(InputBackend):
+    def __init__(self, pause: float = 0.1, failsafe: bool = True):
+        self.pause = pause
+        self.failsafe = failsafe
+        self._pyautogui = None
+
+    def load(self):
+        if self._pyautogui is None:
+            import pyautogui
+
+            pyautogui.PAUSE = self.pause
+            pyautogui.FAILSAFE = self.failsafe
+            self._pyautogui = pyautogui
+        return self._pyautogui
+
+    def click(self, x: int, y: int, clicks: int = 1, button: str = "left"):
+        self.load().click(x, y, clicks=clicks, button=button)
+
+
+class RecordingInput(InputBackend):
+    def __init__(self):
+        self.clicks: List[Tuple[int, int, int, str]] = []
+
+    def click(self, x: int, y: int, clicks: int = 1, button: str = "left"):
+        self.clicks.append((x, y, clicks, button))
@@ -0,0 +1,53 @@
+import cv2
+import numpy as np
+from typing import List, Tuple
+
+Location = Tuple[int, int]
+
+
+def match_full(image: np.ndarray, template: np.ndarray) -> Tuple[float, Location]:
+    result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return max_val, max_loc
+
+
+def top_peaks(result: np.ndarray, count: int, radius: Tuple[int, int]) -> List[Location]:
+    result = result.copy()
+    rx, ry = radius
+    peaks = []
+    for _ in range(count):
+        _, max_val, _, (x, y) = cv2.minMaxLoc(result)
+        if max_val <= -1.0:
+            break
+        peaks.append((x, y))
+        result[max(0, y - ry):y + ry + 1, max(0, x - rx):x + rx + 1] = -1.0
+    return peaks
+
+
+def match_region(image: np.ndarray, template: np.ndarray, x: int, y: int, pad: int) -> Tuple[float, Location]:
+    th, tw = template.shape[:2]
+    x0 = max(0, x - pad)
+    y0 = max(0, y - pad)
+    x1 = min(image.shape[1], x + tw + pad)
+    y1 = min(image.shape[0], y + th + pad)
+    if x1 - x0 < tw or y1 - y0 < th:
+        return -1.0, (x, y)
+
+    max_val, (lx, ly) = match_full(image[y0:y1, x0:x1], template)
+    return max_val, (x0 + lx, y0 + ly)
+
+
+def match_pyramid(image: np.ndarray, coarse_image: np.ndarray, template: np.ndarray, coarse_template: np.ndarray, level: int, candidates: int = 3) -> Tuple[float, Location]:
+    factor = 2 ** level
+    result = cv2.matchTemplate(coarse_image, coarse_template, cv2.TM_CCOEFF_NORMED)
+    ch, cw = coarse_template.shape[:2]
+    peaks = top_peaks(result, candidates, (max(1, cw // 2), max(1, ch // 2)))
+    if not peaks:
+        return match_full(image, template)
+
+    best_val, best_loc = -1.0, (0, 0)
+    for cx, cy in peaks:
+        val, loc = match_region(image, template, cx * factor, cy * factor, factor + 2)
+        if val > best_val:
+            best_val, best_loc = val, loc
+    return best_val, best_loc
@@ -0,0 +1,91 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class Histogram:
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        self._samples.append(value)
+
+    def snapshot(self) -> dict[str, float]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"count": self.count, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+        def pct(p: float) -> float:
+            return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+        return {
+            "count": self.count,
+            "mean_ms": sum(samples) / len(samples) * 1000,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": self.max * 1000,
+        }
+
+
+class MetricsRegistry:
+    WINDOW = 512
+
+    def __init__(self, window: int = WINDOW):
+        self.window = window
+        self.enabled = True
+        self._counters: dict[str, int] = {}
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self.window)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "counters": dict(self._counters),
+                "histograms": {name: histogram.snapshot() for name, histogram in self._histograms.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
@@ -11,6 +11,7 @@ class MatchResult:
     width: int = 0
     height: int = 0
     confidence: float = 0.0
+    scale: float = 0.0
 
     @property
     def center(self) -> Tuple[int, int]:
@@ -0,0 +1,39 @@
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+from .spectral import window_sums
+
+Stats = Tuple[float, float]
+Region = Tuple[int, int, int, int]
+
+FLAT_STD = 1.0
+
+
+def template_stats(gray: np.ndarray) -> Stats:
+    mean, std = cv2.meanStdDev(gray)
+    return float(mean[0][0]), float(std[0][0])
+
+
+def candidate_mask(sums: np.ndarray, sqsums: np.ndarray, width: int, height: int) -> np.ndarray:
+    count = float(width * height)
+    means = window_sums(sums, width, height) / count
+    variance = window_sums(sqsums, width, height)
+    variance *= 1.0 / count
+    variance -= means * means
+    return variance >= FLAT_STD * FLAT_STD
+
+
+def candidate_region(mask: np.ndarray, factor: int, size: Tuple[int, int], frame_size: Tuple[int, int]) -> Optional[Region]:
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(mask.any(axis=0))
+
+    tw, th = size
+    width, height = frame_size
+    x0 = max(0, (int(cols[0]) - 1) * factor)
+    y0 = max(0, (int(rows[0]) - 1) * factor)
+    x1 = min(width, (int(cols[-1]) + 1) * factor + tw + factor)
+    y1 = min(height, (int(rows[-1]) + 1) * factor + th + factor)
+    return x0, y0, x1 - x0, y1 - y0
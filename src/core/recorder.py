@@ -0,0 +1,151 @@
+import cv2
+import json
+import time
+import queue
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from .frame import Frame
+
+
+class SessionRecorder:
+    FORMAT_VERSION = 1
+    FRAMES_FILENAME = "frames.bin"
+    INDEX_FILENAME = "index.jsonl"
+    HEADER_FILENAME = "session.json"
+    ENCODINGS = (".jpg", ".png")
+    QUEUE_SIZE = 32
+
+    def __init__(self, path: Union[str, Path], downsample: int = 2, encoding: str = ".jpg", quality: int = 80, every: int = 1, queue_size: int = QUEUE_SIZE):
+        if encoding not in self.ENCODINGS:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+        self.path = Path(path)
+        self.downsample = max(1, int(downsample))
+        self.encoding = encoding
+        self.quality = quality
+        self.every = max(1, int(every))
+        self.recorded = 0
+        self.dropped = 0
+        self.bytes_written = 0
+        self.failed = 0
+        self.last_error: Optional[str] = None
+        self._ticks = 0
+        self._started = time.perf_counter()
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, meta: Optional[dict] = None):
+        if self.running:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        header = {"version": self.FORMAT_VERSION, "encoding": self.encoding, "downsample": self.downsample, "started": time.strftime("%Y-%m-%dT%H:%M:%S"), **(meta or {})}
+        (self.path / self.HEADER_FILENAME).write_text(json.dumps(header, indent=2))
+
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._writer_loop, name="session-recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, frame: Optional[Frame], tick: dict[str, Any]) -> bool:
+        if self._thread is None:
+            return False
+        if not self._thread.is_alive():
+            self.dropped += 1
+            return False
+
+        self._ticks += 1
+        image = None
+        size = None
+        if frame is not None and (self._ticks - 1) % self.every == 0:
+            source = frame.bgra if frame.bgra is not None else frame.image
+            size = frame.size
+            if self.downsample > 1:
+                image = cv2.resize(source, (frame.width // self.downsample, frame.height // self.downsample), interpolation=cv2.INTER_AREA)
+            else:
+                image = source.copy()
+
+        try:
+            self._queue.put_nowait((time.perf_counter() - self._started, image, size, tick))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def _encode(self, image: np.ndarray) -> bytes:
+        if image.ndim == 3 and image.shape[2] == 4:
+            image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.quality] if self.encoding == ".jpg" else [cv2.IMWRITE_PNG_COMPRESSION, 3]
+        ok, data = cv2.imencode(self.encoding, image, params)
+        if not ok:
+            raise ValueError("Failed to encode frame")
+        return data.tobytes()
+
+    def _writer_loop(self):
+        frames = index = None
+        try:
+            frames = open(self.path / self.FRAMES_FILENAME, "ab")
+            index = open(self.path / self.INDEX_FILENAME, "a")
+        except OSError as e:
+            self.last_error = str(e)
+            if frames is not None:
+                frames.close()
+            return
+
+        with frames, index:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                try:
+                    self._write(frames, index, *item)
+                except Exception as e:
+                    self.failed += 1
+                    self.last_error = str(e)
+
+    def _write(self, frames, index, timestamp: float, image: Optional[np.ndarray], size: Optional[tuple], tick: dict[str, Any]):
+        entry = {"i": self.recorded, "t": round(timestamp, 4), **tick}
+        if image is not None:
+            data = self._encode(image)
+            offset = frames.tell()
+            frames.write(data)
+            frames.flush()
+            entry.update(offset=offset, length=len(data), size=list(size))
+            self.bytes_written += len(data)
+
+        index.write(json.dumps(entry) + "\n")
+        index.flush()
+        self.recorded += 1
+
+    def stop(self, timeout: Optional[float] = 10.0):
+        if self._thread is None:
+            return
+        if self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+        self._thread = None
+
+
+def is_session_archive(path: Union[str, Path]) -> bool:
+    return (Path(path) / SessionRecorder.INDEX_FILENAME).exists()
+
+
+def read_session_index(path: Union[str, Path]) -> list[dict]:
+    entries = []
+    with open(Path(path) / SessionRecorder.INDEX_FILENAME) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return entries
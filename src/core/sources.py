@@ -0,0 +1,114 @@
+import cv2
+import time
+import numpy as np
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from .frame import Frame
+from .recorder import SessionRecorder, is_session_archive, read_session_index
+
+
+class FrameSource(ABC):
+    window_relative = True
+
+    @abstractmethod
+    def grab(self) -> Optional[Frame]:
+        ...
+
+    def get_offset(self) -> Tuple[int, int]:
+        return (0, 0)
+
+    def close(self):
+        pass
+
+
+class ReplayFrameSource(FrameSource):
+    IMAGE_PATTERNS = ("*.png", "*.jpg", "*.jpeg", "*.bmp")
+
+    def __init__(self, path: Union[str, Path], fps: Optional[float] = None, loop: bool = False, key: Optional[str] = None):
+        self.path = Path(path)
+        self.fps = fps
+        self.loop = loop
+        self.index = 0
+        self._files: List[Path] = []
+        self._stack: Optional[np.ndarray] = None
+        self._archive: Optional[np.ndarray] = None
+        self.entries: List[dict] = []
+        self._next_time: Optional[float] = None
+
+        if self.path.is_dir() and is_session_archive(self.path):
+            self.entries = [entry for entry in read_session_index(self.path) if "offset" in entry]
+            if self.entries:
+                self._archive = np.memmap(self.path / SessionRecorder.FRAMES_FILENAME, dtype=np.uint8, mode="r")
+        elif self.path.is_dir():
+            for pattern in self.IMAGE_PATTERNS:
+                self._files.extend(self.path.glob(pattern))
+            self._files.sort()
+        elif self.path.suffix == ".npy":
+            self._stack = np.load(self.path, mmap_mode="r")
+        elif self.path.suffix == ".npz":
+            archive = np.load(self.path)
+            self._stack = archive[key or archive.files[0]]
+        else:
+            raise ValueError(f"Unsupported replay source: {self.path}")
+
+        if len(self) == 0:
+            raise ValueError(f"No frames found in {self.path}")
+
+    def __len__(self) -> int:
+        if self._archive is not None:
+            return len(self.entries)
+        return len(self._stack) if self._stack is not None else len(self._files)
+
+    @property
+    def exhausted(self) -> bool:
+        return not self.loop and self.index >= len(self)
+
+    def rewind(self):
+        self.index = 0
+        self._next_time = None
+
+    def _pace(self):
+        if not self.fps:
+            return
+        now = time.perf_counter()
+        if self._next_time is not None and self._next_time > now:
+            time.sleep(self._next_time - now)
+            now = self._next_time
+        self._next_time = now + 1.0 / self.fps
+
+    def _load(self, index: int) -> np.ndarray:
+        if self._stack is not None:
+            return np.asarray(self._stack[index])
+
+        if self._archive is not None:
+            entry = self.entries[index]
+            image = cv2.imdecode(self._archive[entry["offset"]:entry["offset"] + entry["length"]], cv2.IMREAD_UNCHANGED)
+            if image is None:
+                raise ValueError(f"Failed to decode frame {entry['i']} from {self.path}")
+            width, height = entry["size"]
+            if image.shape[1] != width or image.shape[0] != height:
+                image = cv2.resize(image, (width, height), interpolation=cv2.INTER_LINEAR)
+            return image
+
+        image = cv2.imread(str(self._files[index]), cv2.IMREAD_UNCHANGED)
+        if image is None:
+            raise ValueError(f"Failed to read frame: {self._files[index]}")
+        return image
+
+    def grab(self) -> Optional[Frame]:
+        if self.exhausted:
+            return None
+        if self.index >= len(self):
+            self.rewind()
+
+        image = self._load(self.index)
+        self.index += 1
+        self._pace()
+
+        if image.ndim == 2:
+            return Frame(cv2.cvtColor(image, cv2.COLOR_GRAY2BGR))
+        if image.shape[2] == 4:
+            return Frame.from_bgra(image)
+        return Frame(image)
@@ -0,0 +1,116 @@
+import cv2
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Hashable, List, Tuple
+
+Location = Tuple[int, int]
+
+
+def window_sums(integral: np.ndarray, width: int, height: int) -> np.ndarray:
+    sums = integral[height:, width:] - integral[:-height, width:]
+    sums -= integral[height:, :-width]
+    sums += integral[:-height, :-width]
+    return sums
+
+
+class FrameSpectrum:
+    def __init__(self, image: np.ndarray):
+        self.height, self.width = image.shape[:2]
+        self.shape = (cv2.getOptimalDFTSize(self.height), cv2.getOptimalDFTSize(self.width))
+        self.spectra: List[np.ndarray] = []
+        self.sums: List[np.ndarray] = []
+        self.sqsums: List[np.ndarray] = []
+        for channel in (cv2.split(image) if image.ndim == 3 else [image]):
+            padded = np.zeros(self.shape, dtype=np.float32)
+            padded[:self.height, :self.width] = channel
+            self.spectra.append(cv2.dft(padded, nonzeroRows=self.height))
+            sums, sqsums = cv2.integral2(channel, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+            self.sums.append(sums)
+            self.sqsums.append(sqsums)
+
+    @property
+    def channels(self) -> int:
+        return len(self.spectra)
+
+
+class TemplateSpectrum:
+    def __init__(self, template: np.ndarray, shape: Tuple[int, int]):
+        self.height, self.width = template.shape[:2]
+        self.spectra: List[np.ndarray] = []
+        self.norm = 0.0
+        for channel in (cv2.split(template) if template.ndim == 3 else [template]):
+            centered = channel.astype(np.float32) - float(channel.mean())
+            self.norm += float(np.dot(centered.ravel(), centered.ravel()))
+            padded = np.zeros(shape, dtype=np.float32)
+            padded[:self.height, :self.width] = centered
+            self.spectra.append(cv2.dft(padded, nonzeroRows=self.height))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(spectrum.nbytes for spectrum in self.spectra)
+
+
+class SpectralMatcher:
+    MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.cached_bytes = 0
+        self._spectra: OrderedDict[Tuple[Hashable, Tuple[int, int]], TemplateSpectrum] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._spectra.clear()
+            self.cached_bytes = 0
+
+    def template_spectrum(self, key: Hashable, template: np.ndarray, shape: Tuple[int, int]) -> TemplateSpectrum:
+        cache_key = (key, shape)
+        with self._lock:
+            cached = self._spectra.get(cache_key)
+            if cached is not None:
+                self._spectra.move_to_end(cache_key)
+                return cached
+
+        spectrum = TemplateSpectrum(template, shape)
+        with self._lock:
+            if cache_key not in self._spectra:
+                self._spectra[cache_key] = spectrum
+                self.cached_bytes += spectrum.nbytes
+                while self.cached_bytes > self.max_bytes and len(self._spectra) > 1:
+                    _, evicted = self._spectra.popitem(last=False)
+                    self.cached_bytes -= evicted.nbytes
+        return spectrum
+
+    def correlate(self, frame: FrameSpectrum, key: Hashable, template: np.ndarray) -> np.ndarray:
+        spectrum = self.template_spectrum(key, template, frame.shape)
+        th, tw = spectrum.height, spectrum.width
+        rows = frame.height - th + 1
+        cols = frame.width - tw + 1
+        count = float(tw * th)
+
+        numerator = np.zeros((rows, cols), dtype=np.float32)
+        variance = np.zeros((rows, cols), dtype=np.float64)
+        for image_spectrum, template_spectrum, sums, sqsums in zip(frame.spectra, spectrum.spectra, frame.sums, frame.sqsums):
+            product = cv2.mulSpectrums(image_spectrum, template_spectrum, 0, conjB=True)
+            numerator += cv2.idft(product, flags=cv2.DFT_REAL_OUTPUT | cv2.DFT_SCALE)[:rows, :cols]
+            window = window_sums(sums, tw, th)
+            window *= window
+            window *= 1.0 / count
+            variance += window_sums(sqsums, tw, th)
+            variance -= window
+
+        np.maximum(variance, 0.0, out=variance)
+        variance *= spectrum.norm
+        denominator = np.sqrt(variance).astype(np.float32)
+        result = np.zeros((rows, cols), dtype=np.float32)
+        np.divide(numerator, denominator, out=result, where=denominator > max(1e-6, spectrum.norm * 1e-7))
+        return np.clip(result, -1.0, 1.0, out=result)
+
+    def match(self, frame: FrameSpectrum, key: Hashable, template: np.ndarray) -> Tuple[float, Location]:
+        th, tw = template.shape[:2]
+        if th > frame.height or tw > frame.width:
+            return -1.0, (0, 0)
+        _, max_val, _, max_loc = cv2.minMaxLoc(self.correlate(frame, key, template))
+        return max_val, max_loc
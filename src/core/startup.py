@@ -0,0 +1,52 @@
+import sys
+import time
+import importlib
+import threading
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Iterator, List, Optional, Tuple
+
+
+class StartupProfile:
+    def __init__(self, enabled: bool = False, started: Optional[float] = None):
+        self.enabled = enabled
+        self.started = started if started is not None else time.perf_counter()
+        self.entries: List[Tuple[str, float, float, str]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_argv(cls, argv: Optional[List[str]] = None, started: Optional[float] = None) -> "StartupProfile":
+        return cls("--startup-profile" in (sys.argv if argv is None else argv), started)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.entries.append((name, start - self.started, end - start, threading.current_thread().name))
+
+    def import_module(self, name: str) -> Optional[ModuleType]:
+        cached = name in sys.modules
+        with self.phase(f"import {name}" + (" (cached)" if cached else "")):
+            try:
+                return importlib.import_module(name)
+            except ImportError:
+                return None
+
+    def mark(self, name: str):
+        with self._lock:
+            self.entries.append((name, self.elapsed(), 0.0, threading.current_thread().name))
+
+    def report(self) -> List[str]:
+        with self._lock:
+            entries = sorted(self.entries, key=lambda entry: entry[1])
+        lines = [f"{'at ms':>9} {'took ms':>9}  {'thread':<16} step"]
+        for name, at, took, thread in entries:
+            lines.append(f"{at * 1000:>9.1f} {took * 1000:>9.1f}  {thread:<16} {name}")
+        return lines
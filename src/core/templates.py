@@ -0,0 +1,120 @@
+import cv2
+import hashlib
+import weakref
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+
+def template_content_id(template: np.ndarray) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{template.shape}:{template.dtype}".encode())
+    digest.update(np.ascontiguousarray(template).tobytes())
+    return digest.hexdigest()
+
+
+class TemplateEntry:
+    def __init__(self, template: np.ndarray, gray: Optional[np.ndarray] = None, template_id: Optional[str] = None):
+        self.template = template
+        self.template_id = template_id or template_content_id(template)
+        self.name = self.template_id
+        self.gray = gray if gray is not None else cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+        self.pinned: dict[Tuple[float, bool, int], np.ndarray] = {}
+        self.engine: Optional[str] = None
+        self.stats: dict[Tuple[float, int], Tuple[float, float]] = {}
+
+    def source(self, grayscale: bool) -> np.ndarray:
+        return self.gray if grayscale else self.template
+
+    def scaled_size(self, scale: float) -> Tuple[int, int]:
+        return (int(self.template.shape[1] * scale), int(self.template.shape[0] * scale))
+
+
+class TemplateStore:
+    MIN_SIZE = 10
+    MAX_ON_DEMAND = 256
+
+    def __init__(self, max_on_demand: int = MAX_ON_DEMAND):
+        self.max_on_demand = max_on_demand
+        self._entries: dict[int, Tuple[weakref.ref, TemplateEntry]] = {}
+        self._by_content: dict[str, TemplateEntry] = {}
+        self._on_demand: OrderedDict[Tuple[int, float, bool, int], np.ndarray] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, template: np.ndarray) -> TemplateEntry:
+        known = self._entries.get(id(template))
+        if known is not None and known[0]() is template:
+            return known[1]
+        return self.register(template)
+
+    def register(self, template: np.ndarray, scales: Iterable[float] = (), gray: Optional[np.ndarray] = None, template_id: Optional[str] = None, levels: Iterable[np.ndarray] = ()) -> TemplateEntry:
+        template_id = template_id or template_content_id(template)
+        with self._lock:
+            existing = self._by_content.get(template_id)
+            if existing is not None:
+                self._remember(template, existing)
+        if existing is not None:
+            return existing
+
+        entry = TemplateEntry(template, gray, template_id)
+        for scale in scales:
+            resized = self._resize(entry.gray, entry.scaled_size(scale))
+            if resized is not None:
+                entry.pinned[(round(scale, 2), True, 0)] = resized
+        for n, level in enumerate(levels, start=1):
+            entry.pinned[(1.0, True, n)] = level
+        with self._lock:
+            self._remember(template, entry)
+            self._by_content[template_id] = entry
+        return entry
+
+    def _remember(self, template: np.ndarray, entry: TemplateEntry):
+        key = id(template)
+        self._entries[key] = (weakref.ref(template, lambda ref: self._forget(key, ref)), entry)
+
+    def _forget(self, key: int, ref: weakref.ref):
+        with self._lock:
+            known = self._entries.get(key)
+            if known is not None and known[0] is ref:
+                del self._entries[key]
+
+    def scaled(self, entry: TemplateEntry, scale: float, grayscale: bool = True, level: int = 0) -> Optional[np.ndarray]:
+        scale = round(scale, 2)
+        pinned = entry.pinned.get((scale, grayscale, level))
+        if pinned is not None:
+            return pinned
+
+        key = (id(entry), scale, grayscale, level)
+        with self._lock:
+            cached = self._on_demand.get(key)
+            if cached is not None:
+                self._on_demand.move_to_end(key)
+                return cached
+
+        if level == 0:
+            resized = self._resize(entry.source(grayscale), entry.scaled_size(scale))
+        else:
+            resized = self.scaled(entry, scale, grayscale, level - 1)
+            if resized is not None:
+                resized = cv2.pyrDown(resized)
+        if resized is None:
+            return None
+
+        with self._lock:
+            self._on_demand[key] = resized
+            while len(self._on_demand) > self.max_on_demand:
+                self._on_demand.popitem(last=False)
+        return resized
+
+    def clear_on_demand(self):
+        with self._lock:
+            self._on_demand.clear()
+
+    def _resize(self, image: np.ndarray, size: Tuple[int, int]) -> Optional[np.ndarray]:
+        tw, th = size
+        if tw < self.MIN_SIZE or th < self.MIN_SIZE:
+            return None
+        if (tw, th) == (image.shape[1], image.shape[0]):
+            return image
+        return cv2.resize(image, (tw, th), interpolation=cv2.INTER_AREA)
@@ -0,0 +1,72 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+
+class Tracer:
+    RING_SECONDS = 60.0
+    MAX_EVENTS = 200_000
+
+    def __init__(self, ring_seconds: Optional[float] = RING_SECONDS, max_events: int = MAX_EVENTS):
+        self.enabled = False
+        self.ring_seconds = ring_seconds
+        self._events: deque[dict] = deque(maxlen=max_events)
+        self._thread_names: dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._origin = time.perf_counter()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def _append(self, event: dict):
+        with self._lock:
+            self._events.append(event)
+            if self.ring_seconds is not None:
+                cutoff = event["ts"] - self.ring_seconds * 1_000_000
+                while self._events and self._events[0]["ts"] < cutoff:
+                    self._events.popleft()
+
+    def name_thread(self, name: str):
+        self._thread_names[threading.get_ident()] = name
+
+    @contextmanager
+    def span(self, name: str, category: str = "detector", **args: Any) -> Iterator[dict]:
+        if not self.enabled:
+            yield args
+            return
+
+        start = self._now_us()
+        try:
+            yield args
+        finally:
+            self._append({"name": name, "cat": category, "ph": "X", "ts": start, "dur": self._now_us() - start, "pid": self._pid, "tid": threading.get_ident(), "args": args})
+
+    def instant(self, name: str, category: str = "detector", **args: Any):
+        if self.enabled:
+            self._append({"name": name, "cat": category, "ph": "i", "s": "t", "ts": self._now_us(), "pid": self._pid, "tid": threading.get_ident(), "args": args})
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+
+    def dump(self, path: Union[str, Path], last_seconds: Optional[float] = None) -> int:
+        with self._lock:
+            events = list(self._events)
+
+        if last_seconds is not None and events:
+            cutoff = self._now_us() - last_seconds * 1_000_000
+            events = [event for event in events if event["ts"] + event.get("dur", 0) >= cutoff]
+
+        metadata = [{"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}} for tid, name in self._thread_names.items()]
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        return len(events)
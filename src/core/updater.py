@@ -1,9 +1,7 @@
 import re
 import json
 import threading
-from urllib.error import URLError
 from typing import Optional, Tuple, Callable
-from urllib.request import urlopen, Request
 
 GITHUB_OWNER = "muralianand12345"
 GITHUB_REPO = "topheroes-autoclicker"
@@ -45,6 +43,9 @@ def compare_versions(current: str, latest: str) -> int:
 
 
 def check_for_update() -> Optional[Tuple[str, str]]:
+    from urllib.error import URLError
+    from urllib.request import urlopen, Request
+
     try:
         request = Request(RELEASES_API_URL, headers={"Accept": "application/vnd.github.v3+json", "User-Agent": f"{GITHUB_REPO}/{CURRENT_VERSION}"})
         
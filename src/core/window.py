@@ -1,21 +1,26 @@
-import cv2
-import mss
 import ctypes
-import numpy as np
 from ctypes import wintypes
 from dataclasses import dataclass
 from typing import Optional, Tuple, List
 
+from .frame import Frame
+from .capture import CaptureSession
 
-user32 = ctypes.windll.user32
-user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
-user32.GetWindowTextLengthW.argtypes = [wintypes.HWND]
-user32.IsWindowVisible.argtypes = [wintypes.HWND]
-user32.GetWindowRect.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.RECT)]
-user32.GetClientRect.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.RECT)]
-user32.ClientToScreen.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.POINT)]
 
-WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+if hasattr(ctypes, "windll"):
+    user32 = ctypes.windll.user32
+    user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+    user32.GetWindowTextLengthW.argtypes = [wintypes.HWND]
+    user32.IsWindowVisible.argtypes = [wintypes.HWND]
+    user32.GetWindowRect.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.RECT)]
+    user32.GetClientRect.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.RECT)]
+    user32.ClientToScreen.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.POINT)]
+
+    WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+else:
+    # Window targeting is Windows-only; elsewhere the detector falls back to full-screen or replayed frames.
+    user32 = None
+    WNDENUMPROC = None
 
 @dataclass
 class WindowInfo:
@@ -49,6 +54,8 @@ class GameWindow:
     @staticmethod
     def enumerate_windows(min_size: Tuple[int, int] = (200, 200)) -> List[WindowInfo]:
         windows: List[WindowInfo] = []
+        if user32 is None:
+            return windows
         
         def enum_callback(hwnd: int, _: int) -> bool:
             if not user32.IsWindowVisible(hwnd):
@@ -101,7 +108,7 @@ class GameWindow:
         self.last_size = None
         self._capture_failed_count = 0
         
-        if not user32.IsWindowVisible(hwnd):
+        if user32 is None or not user32.IsWindowVisible(hwnd):
             self.hwnd = None
             return False
         
@@ -178,7 +185,7 @@ class GameWindow:
         
         return WindowInfo(hwnd=self.hwnd, title=buffer.value, rect=rect)
     
-    def capture(self) -> Optional[np.ndarray]:
+    def capture(self, session: Optional[CaptureSession] = None) -> Optional[Frame]:
         rect = self.get_client_rect()
         if not rect:
             self._capture_failed_count += 1
@@ -192,13 +199,15 @@ class GameWindow:
             self._capture_failed_count += 1
             return None
         
+        monitor = {"left": left, "top": top, "width": width, "height": height}
         try:
-            with mss.mss() as sct:
-                monitor = {"left": left, "top": top, "width": width, "height": height}
-                screenshot = sct.grab(monitor)
-                img = np.array(screenshot)
-                self._capture_failed_count = 0
-                return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+            if session is not None:
+                frame = session.grab_frame(monitor)
+            else:
+                with CaptureSession() as temp_session:
+                    frame = temp_session.grab_frame(monitor)
+            self._capture_failed_count = 0
+            return frame
         except Exception:
             self._capture_failed_count += 1
             return None
@@ -0,0 +1,126 @@
+import time
+import threading
+from typing import Callable, Optional
+
+from .frame import Frame
+from .models import ActionSequence, MatchResult
+from .detector import ScreenImageDetector
+
+TickCallback = Callable[[Optional[Frame], Optional[ActionSequence], float, float], None]
+ExecutedCallback = Callable[[ActionSequence, bool, float], None]
+StepCallback = Callable[[ActionSequence, str, Optional[Frame], MatchResult], None]
+
+
+class DetectionWorker:
+    def __init__(self, detector: ScreenImageDetector, sequences: list[ActionSequence], enabled: Callable[[], set[str]], check_interval: float = 1.0, cooldown: float = 2.0, step_delay: float = 0.5, log: Optional[Callable[[str], None]] = None, stop_event: Optional[threading.Event] = None, on_tick: Optional[TickCallback] = None, on_executed: Optional[ExecutedCallback] = None, on_step: Optional[StepCallback] = None):
+        self.detector = detector
+        self.sequences = sequences
+        self.enabled = enabled
+        self.check_interval = check_interval
+        self.cooldown = cooldown
+        self.step_delay = step_delay
+        self.stop_event = stop_event or threading.Event()
+        self.on_tick = on_tick
+        self.on_executed = on_executed
+        self.on_step = on_step
+        self.execution_count = 0
+        self.completed_count = 0
+        self.ticks = 0
+        self._log = log
+
+    def log(self, message: str):
+        if self._log:
+            self._log(message)
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _sleep(self, seconds: float):
+        with self.detector.metrics.time("sleep"):
+            self.stop_event.wait(seconds)
+
+    def tick(self) -> Optional[ActionSequence]:
+        detector = self.detector
+        metrics = detector.metrics
+
+        enabled = self.enabled()
+        if not enabled:
+            self.stop_event.wait(self.check_interval)
+            return None
+
+        tick_start = time.perf_counter()
+        self.ticks += 1
+        metrics.increment("ticks")
+        with detector.tracer.span("tick", "worker") as trace_args:
+            frame = detector.capture_screen()
+            capture_time = time.perf_counter() - tick_start
+            new_size = detector.check_window_resized()
+            if new_size:
+                self.log(f"Window resized to {new_size[0]}x{new_size[1]} (predicted {detector.last_resize_predicted} template scale(s))")
+
+            sequence = detector.find_first_sequence(self.sequences, enabled, frame)
+            trace_args["sequence"] = sequence.name if sequence else None
+
+        tick_time = time.perf_counter() - tick_start
+        metrics.observe("tick", tick_time)
+        if self.on_tick:
+            self.on_tick(frame, sequence, capture_time, tick_time)
+
+        if sequence is None:
+            self._sleep(self.check_interval)
+            return None
+
+        self.execution_count += 1
+        metrics.increment("sequences_found")
+        self.log(f"Found '{sequence.name}' (#{self.execution_count})")
+
+        execute_start = time.perf_counter()
+        success = detector.execute_sequence(sequence, step_delay=self.step_delay, log_callback=self.log, stop_flag=self.stop_event.is_set, frame=frame, on_step=self._step_callback(sequence))
+        if success:
+            self.completed_count += 1
+            self.log("Completed!")
+        else:
+            self.log("Incomplete")
+        if self.on_executed:
+            self.on_executed(sequence, success, time.perf_counter() - execute_start)
+
+        self._sleep(self.cooldown)
+        return sequence
+
+    def _step_callback(self, sequence: ActionSequence) -> Optional[Callable[[str, Optional[Frame], MatchResult], None]]:
+        if not self.on_step:
+            return None
+        return lambda name, frame, match: self.on_step(sequence, name, frame, match)
+
+    def run(self, max_ticks: Optional[int] = None, duration: Optional[float] = None):
+        self.detector.tracer.name_thread("worker")
+        deadline = time.perf_counter() + duration if duration is not None else None
+
+        while not self.stop_event.is_set():
+            if max_ticks is not None and self.ticks >= max_ticks:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            try:
+                self.tick()
+            except EOFError:
+                break
+            except Exception as e:
+                self.log(f"Error: {e}")
+                self.stop_event.wait(self.check_interval)
+
+        self.detector.close_capture_session()
+        self.detector.close_executor()
+
+    def log_summary(self):
+        detector = self.detector
+        roi_stats = detector.get_roi_stats()
+        self.log(f"Region search: {roi_stats['hits']} hit(s), {roi_stats['misses']} miss(es)")
+        tile_stats = detector.incremental.get_stats()
+        if tile_stats["reused"]:
+            total_tiles = tile_stats["matched"] + tile_stats["reused"]
+            self.log(f"Incremental matching reused {tile_stats['reused']}/{total_tiles} tile(s)")
+        gate = detector.change_gate
+        if gate.enabled:
+            self.log(f"Static frames skipped: {gate.skipped}/{gate.checked} ({gate.skip_rate:.0%})")
+        self.log(f"Stopped. Total: {self.execution_count}")
@@ -1,13 +1,16 @@
+from __future__ import annotations
+
 import time
 import threading
 import webbrowser
 import tkinter as tk
 from tkinter import ttk
-from pynput import keyboard
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from core import Config, StartupProfile, check_for_update_async, CURRENT_VERSION
 
-from embedded_assets import ASSETS
-from core import Config, ScreenImageDetector, ActionSequence, WindowInfo, check_for_update_async, CURRENT_VERSION
+if TYPE_CHECKING:
+    from core import Frame, ScreenImageDetector, SessionRecorder, ActionSequence, MatchResult, WindowInfo
 
 
 class WindowSelectorDialog:
@@ -79,7 +82,16 @@ class WindowSelectorDialog:
 
 
 class AutoClickerApp:
-    def __init__(self):
+    STATS_STAGES = ("tick", "capture", "convert", "match", "click", "sleep")
+    STATS_REFRESH_MS = 1000
+    METRICS_SNAPSHOT_INTERVAL = 10.0
+    TRACE_SLOW_TICK = 1.0
+    TRACE_DUMP_COOLDOWN = 30.0
+    WORKER_JOIN_TIMEOUT = 5.0
+    PRELOAD_MODULES = ("numpy", "cv2", "mss", "pynput.keyboard", "core.detector")
+
+    def __init__(self, startup: Optional[StartupProfile] = None):
+        self.startup = startup or StartupProfile()
         self.root = tk.Tk()
         self.root.title(f"Top Heroes Auto-Clicker v{CURRENT_VERSION}")
 
@@ -98,18 +110,23 @@ class AutoClickerApp:
         self.is_running = False
         self.stop_event = threading.Event()
         self.worker_thread: Optional[threading.Thread] = None
+        self._closing = False
         self.detector: Optional[ScreenImageDetector] = None
         self.sequences: list[ActionSequence] = []
         self.sequence_vars: dict[str, tk.BooleanVar] = {}
         
         # Update banner reference
         self.update_banner: Optional[tk.Frame] = None
+        self._last_metrics_snapshot = 0.0
+        self._stats_job: Optional[str] = None
+        self._last_trace_dump = 0.0
+        self.recorder: Optional[SessionRecorder] = None
 
         # Setup
-        self._setup_ui()
-        self._load_sequences()
-        self._load_saved_config()
-        self._setup_hotkeys()
+        with self.startup.phase("build UI"):
+            self._setup_ui()
+            self._load_saved_config()
+        self._load_in_background()
         self._check_for_updates()
 
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
@@ -170,7 +187,7 @@ class AutoClickerApp:
         self.sequences_container = ttk.Frame(seq_frame)
         self.sequences_container.pack(fill=tk.X)
 
-        self.no_sequences_label = ttk.Label(self.sequences_container, text="No sequences loaded. Check embedded_assets.py", foreground="gray")
+        self.no_sequences_label = ttk.Label(self.sequences_container, text="Loading templates...", foreground="gray")
         self.no_sequences_label.pack(anchor=tk.W)
 
         # === Settings Frame ===
@@ -204,6 +221,45 @@ class AutoClickerApp:
         ttk.Entry(settings_grid, textvariable=self.confidence_var, width=8).grid(row=3, column=1, padx=5, pady=2)
         ttk.Label(settings_grid, text="(0.0-1.0)").grid(row=3, column=2, sticky=tk.W, pady=2)
 
+        # Match Mode
+        ttk.Label(settings_grid, text="Match Mode:").grid(row=4, column=0, sticky=tk.W, pady=2)
+        self.match_mode_var = tk.StringVar(value="full")
+        self.match_mode_combo = ttk.Combobox(settings_grid, textvariable=self.match_mode_var, values=("full",), state="readonly", width=8)
+        self.match_mode_combo.grid(row=4, column=1, padx=5, pady=2)
+        ttk.Label(settings_grid, text="(pyramid = faster first scans on large windows)").grid(row=4, column=2, sticky=tk.W, pady=2)
+
+        # Change Threshold
+        ttk.Label(settings_grid, text="Change Threshold:").grid(row=5, column=0, sticky=tk.W, pady=2)
+        self.change_threshold_var = tk.StringVar(value="")
+        ttk.Entry(settings_grid, textvariable=self.change_threshold_var, width=8).grid(row=5, column=1, padx=5, pady=2)
+        ttk.Label(settings_grid, text="(0 = scan every frame)").grid(row=5, column=2, sticky=tk.W, pady=2)
+
+        # Parallel Matching
+        ttk.Label(settings_grid, text="Parallel Matching:").grid(row=6, column=0, sticky=tk.W, pady=2)
+        self.parallel_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_grid, variable=self.parallel_var).grid(row=6, column=1, padx=5, pady=2)
+        ttk.Label(settings_grid, text="(match sequences/scales on all cores)").grid(row=6, column=2, sticky=tk.W, pady=2)
+
+        # === Stats Frame ===
+        stats_frame = ttk.LabelFrame(main_frame, text="Stats", padding="10")
+        stats_frame.pack(fill=tk.X, pady=(0, 10))
+
+        self.stats_text = tk.Text(stats_frame, height=8, state=tk.DISABLED, wrap=tk.NONE, font=("Consolas", 9))
+        self.stats_text.pack(fill=tk.X)
+
+        self.metrics_snapshot_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(stats_frame, text="Write JSON snapshots to config folder", variable=self.metrics_snapshot_var).pack(anchor=tk.W, pady=(5, 0))
+
+        trace_frame = ttk.Frame(stats_frame)
+        trace_frame.pack(fill=tk.X)
+
+        self.trace_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(trace_frame, text="Trace (dump last 60s on miss/slow tick)", variable=self.trace_var, command=self._on_trace_toggled).pack(side=tk.LEFT)
+        ttk.Button(trace_frame, text="Dump Trace", command=lambda: self._dump_trace("manual")).pack(side=tk.RIGHT)
+
+        self.record_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(stats_frame, text="Record session (frames + decisions, for offline replay)", variable=self.record_var).pack(anchor=tk.W)
+
         # === Log Frame ===
         log_frame = ttk.LabelFrame(main_frame, text="Log", padding="10")
         log_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
@@ -335,39 +391,88 @@ class AutoClickerApp:
         self.config.clear_window()
         self.log("Cleared window selection, using full screen")
 
-    def _load_sequences(self):
-        if not ASSETS:
-            self.log("No embedded assets found.")
-            self.log("Run: python scripts/embed_assets.py")
-            return
-
+    def _load_in_background(self):
         try:
             confidence = float(self.confidence_var.get())
         except ValueError:
             confidence = 0.8
 
-        self.detector = ScreenImageDetector(confidence_threshold=confidence)
-        self.sequences = self.detector.load_embedded_sequences(ASSETS)
+        calibration = self.config.get_scale_calibration()
+        threading.Thread(target=self._background_load, args=(confidence, calibration), name="startup-loader", daemon=True).start()
+
+    def _background_load(self, confidence: float, calibration: dict):
+        startup = self.startup
+        try:
+            for module in self.PRELOAD_MODULES:
+                startup.import_module(module)
+
+            from core import ScreenImageDetector, open_asset_pack
+
+            detector = ScreenImageDetector(confidence_threshold=confidence)
+            detector.load_scale_calibration(calibration)
+            sequences: list[ActionSequence] = []
+            with startup.phase("load templates"):
+                asset_pack = open_asset_pack()
+                if asset_pack is not None:
+                    sequences = detector.load_asset_pack(asset_pack)
+                else:
+                    from embedded_assets import ASSETS
+
+                    if ASSETS:
+                        sequences = detector.load_embedded_sequences(ASSETS)
+                    else:
+                        self._log_from_thread("No embedded assets found.")
+                        self._log_from_thread("Run: python scripts/embed_assets.py")
+
+            with startup.phase("load pyautogui"):
+                detector.input.load()
+        except Exception as e:
+            self._log_from_thread(f"Failed to load detector: {e}")
+            return
+
+        self.root.after(0, lambda: self._on_loaded(detector, sequences))
+
+    def _on_loaded(self, detector: ScreenImageDetector, sequences: list[ActionSequence]):
+        self.detector = detector
+        self.sequences = sequences
+
+        self.match_mode_combo.configure(values=detector.MATCH_MODES)
+        if self.match_mode_var.get() not in detector.MATCH_MODES:
+            self.match_mode_var.set(detector.match_mode)
+        if not self.change_threshold_var.get():
+            self.change_threshold_var.set(str(detector.change_gate.DEFAULT_THRESHOLD))
+        self._on_trace_toggled()
+        self._restore_saved_window()
+
+        with self.startup.phase("hotkeys"):
+            self._setup_hotkeys()
 
         if not self.sequences:
+            self.no_sequences_label.configure(text="No sequences loaded. Check embedded_assets.py")
             self.log("No sequences loaded from assets.")
-            return
+        else:
+            self.no_sequences_label.destroy()
 
-        self.no_sequences_label.destroy()
+            for sequence in self.sequences:
+                var = tk.BooleanVar(value=True)
+                self.sequence_vars[sequence.name] = var
 
-        for sequence in self.sequences:
-            var = tk.BooleanVar(value=True)
-            self.sequence_vars[sequence.name] = var
+                frame = ttk.Frame(self.sequences_container)
+                frame.pack(fill=tk.X, pady=2)
 
-            frame = ttk.Frame(self.sequences_container)
-            frame.pack(fill=tk.X, pady=2)
+                cb = ttk.Checkbutton(frame, variable=var, text=f"{sequence.name}")
+                cb.pack(side=tk.LEFT)
 
-            cb = ttk.Checkbutton(frame, variable=var, text=f"{sequence.name}")
-            cb.pack(side=tk.LEFT)
+                ttk.Label(frame, text=f"({sequence.action_count} actions)", foreground="gray").pack(side=tk.LEFT, padx=(5, 0))
 
-            ttk.Label(frame, text=f"({sequence.action_count} actions)", foreground="gray").pack(side=tk.LEFT, padx=(5, 0))
+            self.log(f"Loaded {len(self.sequences)} sequence(s)")
 
-        self.log(f"Loaded {len(self.sequences)} sequence(s)")
+        self.startup.mark("ready")
+        if self.startup.enabled:
+            self.log(f"Startup: ready after {self.startup.elapsed() * 1000:.0f} ms")
+            for line in self.startup.report():
+                print(line)
+                self.log(line)
 
     def _load_saved_config(self):
         settings = self.config.get_settings()
@@ -380,7 +485,20 @@ class AutoClickerApp:
                 self.step_delay_var.set(settings["step_delay"])
             if "confidence" in settings:
                 self.confidence_var.set(settings["confidence"])
-        
+            if "match_mode" in settings:
+                self.match_mode_var.set(settings["match_mode"])
+            if "change_threshold" in settings:
+                self.change_threshold_var.set(settings["change_threshold"])
+            if "parallel" in settings:
+                self.parallel_var.set(bool(settings["parallel"]))
+            if "metrics_snapshots" in settings:
+                self.metrics_snapshot_var.set(bool(settings["metrics_snapshots"]))
+            if "trace" in settings:
+                self.trace_var.set(bool(settings["trace"]))
+            if "record_session" in settings:
+                self.record_var.set(bool(settings["record_session"]))
+
+    def _restore_saved_window(self):
         saved_window = self.config.get_window()
         if saved_window and self.detector:
             if self.detector.select_window_by_title(saved_window, partial=True):
@@ -395,10 +513,18 @@ class AutoClickerApp:
             "cooldown": self.cooldown_var.get(),
             "step_delay": self.step_delay_var.get(),
             "confidence": self.confidence_var.get(),
+            "match_mode": self.match_mode_var.get(),
+            "change_threshold": self.change_threshold_var.get(),
+            "parallel": self.parallel_var.get(),
+            "metrics_snapshots": self.metrics_snapshot_var.get(),
+            "trace": self.trace_var.get(),
+            "record_session": self.record_var.get(),
         }
         self.config.set_settings(settings)
 
     def _setup_hotkeys(self):
+        from pynput import keyboard
+
         def on_press(key):
             try:
                 if key == keyboard.Key.f6:
@@ -433,6 +559,10 @@ class AutoClickerApp:
         if self.is_running:
             return
 
+        if not self.detector:
+            self.log("Still loading, try again in a moment.")
+            return
+
         if not self.sequences:
             self.log("No sequences available.")
             return
@@ -449,6 +579,19 @@ class AutoClickerApp:
         except ValueError:
             pass
 
+        if self.detector:
+            self.detector.match_mode = self.match_mode_var.get()
+            self.detector.parallel = self.parallel_var.get()
+            self.detector.incremental.reset_stats()
+            try:
+                self.detector.change_gate.threshold = float(self.change_threshold_var.get())
+            except ValueError:
+                self.detector.change_gate.threshold = self.detector.change_gate.DEFAULT_THRESHOLD
+            self.detector.change_gate.reset()
+            self.detector.change_gate.reset_stats()
+            self.detector.metrics.reset()
+            self._start_recording(enabled)
+
         self.is_running = True
         self.stop_event.clear()
 
@@ -470,6 +613,9 @@ class AutoClickerApp:
 
         self.worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
         self.worker_thread.start()
+        if self._stats_job:
+            self.root.after_cancel(self._stats_job)
+        self._stats_job = self.root.after(self.STATS_REFRESH_MS, self._refresh_stats)
 
     def stop(self):
         if not self.is_running:
@@ -501,50 +647,136 @@ class AutoClickerApp:
         except ValueError:
             step_delay = 0.5
 
-        execution_count = 0
+        from core import DetectionWorker
 
-        while not self.stop_event.is_set():
-            try:
-                enabled = self._get_enabled_sequences()
-                if not enabled:
-                    time.sleep(check_interval)
-                    continue
-
-                screenshot = self.detector.capture_screen()
-                new_size = self.detector.check_window_resized()
-                if new_size:
-                    self._log_from_thread(f"Window resized to {new_size[0]}x{new_size[1]}")
-                
-                sequence = self.detector.find_first_sequence(self.sequences, enabled, screenshot)
-
-                if sequence:
-                    execution_count += 1
-                    self._log_from_thread(f"Found '{sequence.name}' (#{execution_count})")
-
-                    success = self.detector.execute_sequence(sequence, step_delay=step_delay, log_callback=self._log_from_thread, stop_flag=lambda: self.stop_event.is_set())
-                    if success:
-                        self._log_from_thread("Completed!")
-                    else:
-                        self._log_from_thread("Incomplete")
+        worker = DetectionWorker(self.detector, self.sequences, self._get_enabled_sequences, check_interval=check_interval, cooldown=cooldown, step_delay=step_delay, log=self._log_from_thread, stop_event=self.stop_event, on_tick=self._on_worker_tick, on_executed=self._on_sequence_executed, on_step=self._on_sequence_step)
+        worker.run()
+        self._save_scale_calibration()
+        self._stop_recording()
 
-                    for _ in range(int(cooldown * 10)):
-                        if self.stop_event.is_set():
-                            break
-                        time.sleep(0.1)
-                else:
-                    time.sleep(check_interval)
+        worker.log_summary()
+        if not self._closing:
+            self.root.after(0, self._refresh_stats)
+
+    def _save_scale_calibration(self):
+        if self.detector is not None and self.detector.scale_calibration_dirty:
+            self.config.set_scale_calibration(self.detector.get_scale_calibration())
+
+    def _on_worker_tick(self, frame: Optional[Frame], sequence: Optional[ActionSequence], capture_time: float, tick_time: float):
+        if tick_time > self.TRACE_SLOW_TICK:
+            self._dump_trace(f"slow tick ({tick_time:.2f}s)", automatic=True)
+        if self.recorder:
+            self._record_tick(frame, {"kind": "tick", "sequence": sequence.name if sequence else None, "capture_ms": round(capture_time * 1000, 2), "tick_ms": round(tick_time * 1000, 2)})
+
+    def _on_sequence_step(self, sequence: ActionSequence, step: str, frame: Optional[Frame], match: MatchResult):
+        if self.recorder:
+            self._record_tick(frame, {"kind": "step", "sequence": sequence.name, "step": step, "found": match.found})
+
+    def _on_sequence_executed(self, sequence: ActionSequence, success: bool, elapsed: float):
+        if not success:
+            self._dump_trace(f"incomplete '{sequence.name}'", automatic=True)
+        if self.recorder:
+            self._record_tick(None, {"kind": "execute", "sequence": sequence.name, "completed": success, "elapsed_ms": round(elapsed * 1000, 2)})
+
+    def _start_recording(self, enabled: set[str]):
+        self.detector.decision_log = None
+        if not self.record_var.get():
+            return
+
+        path = self.config.sessions_dir / f"session-{time.strftime('%Y%m%d-%H%M%S')}"
+        from core import SessionRecorder
+
+        self.recorder = SessionRecorder(path)
+        self.recorder.start({"match_mode": self.detector.match_mode, "confidence": self.detector.confidence_threshold, "enabled": sorted(enabled), "version": CURRENT_VERSION})
+        self.detector.decision_log = []
+        self.log(f"Recording session to {path}")
+
+    def _record_tick(self, frame: Optional[Frame], tick: dict):
+        tick["decisions"] = self.detector.decision_log or []
+        self.detector.decision_log = []
+        self.recorder.record(frame, tick)
+
+    def _stop_recording(self):
+        recorder = self.recorder
+        if recorder is None:
+            return
 
-            except Exception as e:
-                self._log_from_thread(f"Error: {e}")
-                time.sleep(check_interval)
+        self.recorder = None
+        self.detector.decision_log = None
+        recorder.stop()
+        self._log_from_thread(f"Recorded {recorder.recorded} entries ({recorder.bytes_written / 1e6:.1f} MB, {recorder.dropped} dropped, {recorder.failed} failed) to {recorder.path}")
 
-        self._log_from_thread(f"Stopped. Total: {execution_count}")
+    def _on_trace_toggled(self):
+        if self.detector:
+            self.detector.tracer.enabled = self.trace_var.get()
+            if not self.trace_var.get():
+                self.detector.tracer.clear()
+
+    def _dump_trace(self, reason: str, automatic: bool = False):
+        if not self.detector or not self.detector.tracer.enabled:
+            if not automatic:
+                self.log("Tracing is off")
+            return
+
+        now = time.time()
+        if automatic and now - self._last_trace_dump < self.TRACE_DUMP_COOLDOWN:
+            return
+        self._last_trace_dump = now
+
+        path = self.config.traces_dir / f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        count = self.detector.tracer.dump(path)
+        message = f"Trace dumped ({reason}): {count} event(s) -> {path}"
+        if automatic:
+            self._log_from_thread(message)
+        else:
+            self.log(message)
+
+    def _refresh_stats(self):
+        self._stats_job = None
+        if not self.detector:
+            return
+
+        snapshot = self.detector.metrics.snapshot()
+        histograms = snapshot["histograms"]
+        counters = snapshot["counters"]
+
+        lines = [f"{'stage':<10}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'count':>8}"]
+        for stage in self.STATS_STAGES:
+            stats = histograms.get(stage)
+            if stats:
+                lines.append(f"{stage:<10}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['max_ms']:>9.1f}{stats['count']:>8}")
+
+        per_scale = [(name, stats) for name, stats in histograms.items() if name.startswith("match/") and name != "match/roi"]
+        if per_scale:
+            name, stats = max(per_scale, key=lambda item: item[1]["p95_ms"])
+            lines.append(f"slowest: {name[len('match/'):]} p95 {stats['p95_ms']:.1f} ms")
+        lines.append(f"ticks: {counters.get('ticks', 0)}  found: {counters.get('sequences_found', 0)}  clicks: {counters.get('clicks', 0)}")
+
+        self.stats_text.configure(state=tk.NORMAL)
+        self.stats_text.delete(1.0, tk.END)
+        self.stats_text.insert(tk.END, "\n".join(lines))
+        self.stats_text.configure(state=tk.DISABLED)
+
+        now = time.time()
+        if self.metrics_snapshot_var.get() and (not self.is_running or now - self._last_metrics_snapshot >= self.METRICS_SNAPSHOT_INTERVAL):
+            self._last_metrics_snapshot = now
+            self.config.save_metrics_snapshot(snapshot)
+
+        if self.is_running:
+            self._stats_job = self.root.after(self.STATS_REFRESH_MS, self._refresh_stats)
 
     def _log_from_thread(self, message: str):
-        self.root.after(0, lambda: self.log(message))
+        if not self._closing:
+            self.root.after(0, lambda: self.log(message))
 
     def _on_close(self):
         self.stop()
+        self._closing = True
+        if self.worker_thread is not None:
+            self.worker_thread.join(self.WORKER_JOIN_TIMEOUT)
+        self._save_scale_calibration()
+        if self.detector is not None:
+            self.detector.close_executor()
         self._save_settings()
         self.canvas.unbind_all("<MouseWheel>")
         self.canvas.unbind_all("<Button-4>")
@@ -554,4 +786,5 @@ class AutoClickerApp:
         self.root.destroy()
 
     def run(self):
+        self.root.after(0, lambda: self.startup.mark("window shown"))
         self.root.mainloop()
\ No newline at end of file
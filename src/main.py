@@ -6,18 +6,23 @@ Hotkeys:
     F7 - Stop monitoring
 
 Move mouse to top-left corner of screen to emergency stop (pyautogui failsafe).
+
+Pass --startup-profile to print import and initialization times.
 """
 
-import pyautogui
+import time
 
-pyautogui.PAUSE = 0.1
-pyautogui.FAILSAFE = True
+started = time.perf_counter()
 
 
 def main():
-    from gui import AutoClickerApp
+    from core import StartupProfile
+
+    startup = StartupProfile.from_argv(started=started)
+    with startup.phase("import gui"):
+        from gui import AutoClickerApp
 
-    app = AutoClickerApp()
+    app = AutoClickerApp(startup)
     app.run()
 
 